@@ -1,76 +1,136 @@
 ﻿import heapq
-from puzzle_state import PuzzleState
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, stop_search, run_search
+from successors import expand
+from solution_path import SolutionPath
+from permutation_rank import new_visited_set
+from heuristics import manhattan_tables, manhattan_distance
 
 
 class AStarSolver:
-    def __init__(self):
-        self.goal_state = [[1, 2, 3],
-                           [4, 5, 6],
-                            [7, 8, 0]]
+    def __init__(self, size=3, heuristic=None):
+        if heuristic is not None and heuristic.size != size:
+            raise ValueError(f"Heuristic is for {heuristic.size}x{heuristic.size} boards, solver for {size}x{size}")
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.h_delta = manhattan_tables(size).delta
+        self.heuristic = heuristic  # e.g. a PatternDatabase; Manhattan distance when None
         self.nodes_explored = 0
         self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
     
     def calculate_manhattan_distance(self, board):
-        distance = 0
-        for i in range(3):
-            for j in range(3):
-                value = board[i][j]
-                if value != 0:
-                    goal_row = (value - 1) // 3
-                    goal_col = (value - 1) % 3
-                    distance += abs(i - goal_row) + abs(j - goal_col)
-        return distance
+        return manhattan_distance(board)
+    
+    def calculate_heuristic(self, board):
+        if self.heuristic is not None:
+            return self.heuristic.distance(board)
+        return self.calculate_manhattan_distance(board)
     
     def get_possible_moves(self, state):
-        neighbors = []
-        blank_row, blank_col = state.find_blank_position()
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-        
-        for dr, dc, move_name in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in state.board]
-                new_board[blank_row][blank_col], new_board[new_row][new_col] = new_board[new_row][new_col], new_board[blank_row][blank_col]
-                new_state = PuzzleState(board=new_board, g=state.g + 1, h=self.calculate_manhattan_distance(new_board), parent=state, move=move_name)
-                neighbors.append(new_state)
-        return neighbors
+        return expand(state, self.h_delta, self.heuristic)
+    
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+    
+    def solve(self, initial_board, limits=None):
+        """Shortest path to the goal, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
     
-    def solve(self, initial_board):
-        initial_state = PuzzleState(board=initial_board, g=0, h=self.calculate_manhattan_distance(initial_board))
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+    
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+        
+        stats = budget.stats
+        initial_state = PuzzleState(board=initial_board, g=0, h=self.calculate_heuristic(initial_board))
+        stats.heuristic_evaluations = 1
         goal = PuzzleState(board=self.goal_state)
+        # Priority queue: (f, h, counter, state) - ties on f go to the deeper node
         open_set = []
-        heapq.heappush(open_set, initial_state)
-        closed_set = set()
+        counter = 0
+        heapq.heappush(open_set, (initial_state.total_cost, initial_state.h, counter, initial_state))
+        counter += 1
+        # Best known g for every board on the open list. Closed boards are
+        # moved to the bitmap, so this stays proportional to the frontier.
+        best_g = {initial_state.packed: 0}
+        closed_set = new_visited_set(self.size)
         nodes_explored = 0
+        best_state = initial_state  # Expanded board closest to the goal, for partial results
+        stats.phase("search")
         
         while open_set:
-            current = heapq.heappop(open_set)
+            _, _, _, current = heapq.heappop(open_set)
+            packed = current.packed
+            
+            # Lazy deletion: skip entries superseded by a cheaper push or already closed
+            if best_g.get(packed) != current.g:
+                continue
+            if len(best_g) > stats.max_frontier:
+                stats.max_frontier = len(best_g)
+            del best_g[packed]
+            if nodes_explored >= budget.next_check:
+                self.nodes_explored = nodes_explored  # Live count for progress readouts
+                reason = budget.check(self.cancel_requested, nodes_explored, len(closed_set) + len(open_set))
+                if reason is not None:
+                    self.visited_nodes = len(closed_set)
+                    return stop_search(self, reason, budget, self.build_solution_path(best_state),
+                                       len(best_g) + 1, current.total_cost)
+                yield budget.progress(nodes_explored, len(best_g) + 1, current.total_cost)
             nodes_explored += 1
+            if current.h < best_state.h:
+                best_state = current
+            if current.g > stats.max_depth:
+                stats.max_depth = current.g
             
             if current == goal:
-                print(f"A* Solution found! Nodes explored: {nodes_explored}")
                 self.nodes_explored = nodes_explored
                 self.visited_nodes = len(closed_set) + 1
+                stats.phase("path")
                 return self.build_solution_path(current)
             
-            closed_set.add(hash(current))
+            closed_set.add(packed)
             
-            for neighbor in self.get_possible_moves(current):
-                if hash(neighbor) not in closed_set:
-                    heapq.heappush(open_set, neighbor)
+            neighbors = self.get_possible_moves(current)
+            stats.generated += len(neighbors)
+            stats.heuristic_evaluations += len(neighbors)
+            for neighbor in neighbors:
+                known_g = best_g.get(neighbor.packed)
+                if known_g is None:
+                    if neighbor.packed in closed_set:
+                        stats.duplicates += 1
+                        continue
+                elif known_g <= neighbor.g:
+                    stats.duplicates += 1
+                    continue
+                best_g[neighbor.packed] = neighbor.g
+                heapq.heappush(open_set, (neighbor.total_cost, neighbor.h, counter, neighbor))
+                counter += 1
         
-        print(f"A*: No solution found after exploring {nodes_explored} nodes.")
         self.nodes_explored = nodes_explored
         self.visited_nodes = len(closed_set)
         return None
     
     def build_solution_path(self, state):
-        path = []
-        current = state
-        while current is not None:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
+        return SolutionPath.from_state(state, self.h_delta, self.heuristic)
     
     def display_solution(self, solution):
         if solution is None:
@@ -0,0 +1,181 @@
+"""
+Batch solving on top of the single-board solvers.
+
+BatchSolver.solve_many() streams one BatchResult per input board and
+amortizes work across the batch:
+
+- one solver object (and its move and heuristic tables) serves every board,
+- identical boards are solved once,
+- BFS-style queries ("bfs", "bidirectional") share one goal-rooted BFS
+  tree that is grown layer by layer only as far as the deepest board so
+  far, so later boards usually cost a few dictionary lookups,
+- with a solution_cache.SolutionCache, boards solved by earlier batches
+  (or other processes sharing its SQLite file) are not searched again.
+"""
+
+from collections import namedtuple
+
+from puzzle_state import BOARD_SIZE, PuzzleState, goal_board
+from solvability import check_solvability
+from successors import move_tables, MOVE_CODES, MOVE_NAMES
+from solution_path import SolutionPath
+from astar_solver import AStarSolver
+from bfs_solver import BFSSolver
+from dfs_solver import DFSSolver
+from bidirectional_solver import BidirectionalSolver
+from iddfs_solver import IDDFSSolver
+from greedy_solver import GreedySolver
+from idastar_solver import IDAStarSolver
+from bidirectional_astar_solver import BidirectionalAStarSolver
+from beam_solver import BeamSolver
+from table_solver import TableSolver
+from solution_cache import solver_options as solver_option_key
+
+BatchResult = namedtuple("BatchResult", ["index", "board", "solution", "nodes_explored", "visited_nodes"])
+
+SOLVERS = {
+    "astar": AStarSolver,
+    "bfs": BFSSolver,
+    "dfs": DFSSolver,
+    "bidirectional": BidirectionalSolver,
+    "iddfs": IDDFSSolver,
+    "greedy": GreedySolver,
+    "idastar": IDAStarSolver,
+    "bidirectional_astar": BidirectionalAStarSolver,
+    "beam": BeamSolver,
+    "table": TableSolver,
+}
+
+# Blind optimal searches whose answers all come from the shared goal tree
+GOAL_TREE_ALGORITHMS = ("bfs", "bidirectional")
+
+
+class GoalTree:
+    """
+    Breadth-first tree rooted at the goal, grown on demand.
+
+    `moves` maps every packed board reached so far to the code of the
+    move that takes it one step closer to the goal (-1 for the goal), so
+    a path is read off by following codes.
+    """
+
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self.move_tables = move_tables(size)
+        goal = PuzzleState(board=goal_board(size))
+        self.moves = {goal.packed: -1}
+        self.frontier = [(goal.packed, goal.blank, "")]
+        self.nodes_explored = 0
+
+    def grow_to(self, packed):
+        """Add whole layers until `packed` is in the tree. Returns False if it never appears."""
+        tables = self.move_tables
+        cell_mask = tables.cell_mask
+        cell_bits = tables.cell_bits
+        moves = self.moves
+        while packed not in moves:
+            if not self.frontier:
+                return False
+            next_frontier = []
+            for parent, blank, last_move in self.frontier:
+                self.nodes_explored += 1
+                blank_shift = blank * cell_bits
+                for target, target_shift, move_name in tables.pruned[blank][last_move]:
+                    tile = (parent >> target_shift) & cell_mask
+                    child = parent ^ (tile << target_shift) | (tile << blank_shift)
+                    if child not in moves:
+                        # Undoing this move from the child leads back towards the goal
+                        moves[child] = MOVE_CODES[move_name] ^ 1
+                        next_frontier.append((child, target, move_name))
+            self.frontier = next_frontier
+        return True
+
+    def path_moves(self, state):
+        """Move names along the tree from a board already in it to the goal."""
+        targets = self.move_tables.targets
+        moves = []
+        current = state
+        code = self.moves[current.packed]
+        while code != -1:
+            move_name = MOVE_NAMES[code]
+            moves.append(move_name)
+            current = current.slide(targets[current.blank][code])
+            code = self.moves[current.packed]
+        return moves
+
+
+class BatchSolver:
+    """Solve many boards with one algorithm, sharing work between them."""
+
+    def __init__(self, algorithm="astar", size=BOARD_SIZE, solution_cache=None, **solver_options):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(SOLVERS)}")
+        self.algorithm = algorithm
+        self.size = size
+        if algorithm == "table":
+            if size != 3:
+                raise ValueError("The table solver only handles 3x3 boards")
+            self.solver = TableSolver(**solver_options)
+        else:
+            self.solver = SOLVERS[algorithm](size=size, **solver_options)
+        self.goal_tree = GoalTree(size) if algorithm in GOAL_TREE_ALGORITHMS else None
+        self.cache = {}  # packed board -> BatchResult of its first solve
+        self.solution_cache = solution_cache  # Optional SolutionCache shared beyond this batch
+        self.cache_options = solver_option_key(self.solver)
+
+    def solve_many(self, boards):
+        """
+        Yield a BatchResult for every board, in input order, as soon as it
+        is solved. Duplicates of an earlier board reuse its result and
+        report the counts of that first solve.
+        """
+        for index, board in enumerate(boards):
+            if not check_solvability(board, self.size).solvable:
+                # Rejected without searching, so there is nothing worth caching
+                yield self.solve_one(index, board)
+                continue
+
+            initial_state = PuzzleState(board=board)
+            cached = self.cache.get(initial_state.packed)
+            if cached is not None:
+                yield cached._replace(index=index, board=board)
+                continue
+
+            result = self.solve_cached(index, board, initial_state)
+            self.cache[initial_state.packed] = result
+            yield result
+
+    def solve_cached(self, index, board, initial_state):
+        """solve_one(), answered from the solution cache when there is one and it has the board."""
+        if self.solution_cache is None:
+            return self.solve_one(index, board)
+        key = self.solution_cache.key(board, self.algorithm, self.cache_options)
+        moves = self.solution_cache.get(key)
+        if moves is not None:
+            return BatchResult(index, board, SolutionPath(initial_state, moves), 0, 0)
+        result = self.solve_one(index, board)
+        if result.solution is not None:
+            self.solution_cache.put(key, result.solution.moves)
+        return result
+
+    def solve_one(self, index, board):
+        """Solve a single board without consulting the duplicate cache."""
+        if self.goal_tree is None:
+            solution = self.solver.solve(board)
+            return BatchResult(index, board, solution, self.solver.nodes_explored, self.solver.visited_nodes)
+
+        self.solver.solvability = check_solvability(board, self.size)
+        if not self.solver.solvability.solvable:
+            return BatchResult(index, board, None, 0, 0)
+        initial_state = PuzzleState(board=board)
+        explored_before = self.goal_tree.nodes_explored
+        solution = None
+        if self.goal_tree.grow_to(initial_state.packed):
+            solution = SolutionPath.from_names(initial_state, self.goal_tree.path_moves(initial_state))
+        return BatchResult(index, board, solution, self.goal_tree.nodes_explored - explored_before,
+                           len(self.goal_tree.moves))
+
+
+def solve_many(boards, algorithm="astar", size=BOARD_SIZE, solution_cache=None, **solver_options):
+    """Stream BatchResults for `boards`; see BatchSolver.solve_many."""
+    return BatchSolver(algorithm, size, solution_cache, **solver_options).solve_many(boards)
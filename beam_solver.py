@@ -0,0 +1,188 @@
+import heapq
+from array import array
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, stop_search, run_search
+from successors import move_tables, MOVE_CODES
+from solution_path import SolutionPath
+from heuristics import manhattan_tables, manhattan_distance
+
+
+class BeamSolver:
+    """
+    Beam search: breadth-first by depth, but only the beam_width boards
+    with the lowest h survive each layer.
+
+    Memory is fixed by the parameters rather than by the puzzle. Each
+    layer keeps one back pointer per surviving board (parent index and
+    move code), and duplicates are detected with a direct-mapped table of
+    dedup_size slots that simply overwrites on collision, so it can only
+    miss duplicates, never reject a new board. The price is that the
+    search is neither optimal nor complete.
+    """
+
+    def __init__(self, size=3, heuristic=None, beam_width=500, dedup_size=65521, max_depth=1000):
+        if heuristic is not None and heuristic.size != size:
+            raise ValueError(f"Heuristic is for {heuristic.size}x{heuristic.size} boards, solver for {size}x{size}")
+        if beam_width < 1:
+            raise ValueError(f"beam_width must be at least 1, got {beam_width}")
+        if dedup_size < 1:
+            raise ValueError(f"dedup_size must be at least 1, got {dedup_size}")
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.h_delta = manhattan_tables(size).delta
+        self.heuristic = heuristic  # e.g. a PatternDatabase; Manhattan distance when None
+        self.move_tables = move_tables(size)
+        self.beam_width = beam_width  # Boards kept per depth
+        self.dedup_size = dedup_size  # Slots in the duplicate table; a prime spreads packed boards best
+        self.max_depth = max_depth
+        self.nodes_explored = 0
+        self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
+
+    def calculate_manhattan_distance(self, board):
+        return manhattan_distance(board)
+
+    def calculate_heuristic(self, board):
+        if self.heuristic is not None:
+            return self.heuristic.distance(board)
+        return self.calculate_manhattan_distance(board)
+
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+
+    def solve(self, initial_board, limits=None):
+        """Path to the goal within max_depth moves, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
+
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+
+        stats = budget.stats
+        initial_state = PuzzleState(board=initial_board, g=0, h=self.calculate_heuristic(initial_board))
+        stats.heuristic_evaluations = 1
+        goal_packed = PuzzleState(board=self.goal_state).packed
+        self.nodes_explored = 0
+        self.visited_nodes = 1
+        if initial_state.packed == goal_packed:
+            # Count the goal test on the start board as one expansion, like the other solvers
+            stats.phase("search")
+            self.nodes_explored = 1
+            stats.phase("path")
+            return self.build_solution_path(initial_state, [], 0, 0)
+
+        tables = self.move_tables
+        cell_mask = tables.cell_mask
+        cell_bits = tables.cell_bits
+        h_delta = self.h_delta
+        heuristic = self.heuristic
+        dedup_size = self.dedup_size
+        seen = [0] * dedup_size  # Slot packed % dedup_size holds the last board stored there
+        seen[initial_state.packed % dedup_size] = initial_state.packed
+        # Current layer: (h, packed, blank, last move name) per board, in back pointer order
+        beam = [(initial_state.h, initial_state.packed, initial_state.blank, "")]
+        # back_pointers[d][i] = parent index << 2 | move code of board i at depth d
+        back_pointers = [array("I", [0])]
+        best = (initial_state.h, 0, 0)  # (h, depth, index) of the board closest to the goal
+        stats.phase("search")
+
+        for depth in range(1, self.max_depth + 1):
+            stats.max_depth = depth - 1
+            if len(beam) > stats.max_frontier:
+                stats.max_frontier = len(beam)
+            # Children of the whole layer, deduplicated within it: packed -> (h, packed, blank, move, parent index)
+            candidates = {}
+            for parent_index, (h, packed, blank, last_move) in enumerate(beam):
+                if self.nodes_explored >= budget.next_check:
+                    reason = budget.check(self.cancel_requested, self.nodes_explored, len(beam) + len(candidates))
+                    if reason is not None:
+                        stats.heuristic_evaluations += len(candidates)
+                        best_path = self.build_solution_path(initial_state, back_pointers, best[1], best[2])
+                        return stop_search(self, reason, budget, best_path, len(beam), depth - 1)
+                    yield budget.progress(self.nodes_explored, len(beam), depth - 1)
+                self.nodes_explored += 1
+
+                blank_shift = blank * cell_bits
+                cells = heuristic.cells_of(packed) if heuristic is not None else None
+                moves = tables.pruned[blank][last_move]
+                stats.generated += len(moves)
+                for target, target_shift, move_name in moves:
+                    tile = (packed >> target_shift) & cell_mask
+                    child = packed ^ (tile << target_shift) | (tile << blank_shift)
+                    if child == goal_packed:
+                        back_pointers.append(array("I", [parent_index << 2 | MOVE_CODES[move_name]]))
+                        self.visited_nodes += 1
+                        stats.heuristic_evaluations += len(candidates)
+                        stats.phase("path")
+                        return self.build_solution_path(initial_state, back_pointers, depth, 0)
+                    if child in candidates or seen[child % dedup_size] == child:
+                        stats.duplicates += 1
+                        continue
+                    if cells is not None:
+                        child_h = h + heuristic.move_delta(cells, tile, blank)
+                    else:
+                        child_h = h + h_delta[tile][target][blank]
+                    candidates[child] = (child_h, child, target, move_name, parent_index)
+
+            stats.heuristic_evaluations += len(candidates)
+            if not candidates:
+                break
+
+            # Keep the beam_width children with the lowest h
+            survivors = heapq.nsmallest(self.beam_width, candidates.values())
+            beam = []
+            layer = array("I")
+            for child_h, child, target, move_name, parent_index in survivors:
+                seen[child % dedup_size] = child
+                beam.append((child_h, child, target, move_name))
+                layer.append(parent_index << 2 | MOVE_CODES[move_name])
+            back_pointers.append(layer)
+            self.visited_nodes += len(beam)
+            if beam[0][0] < best[0]:
+                best = (beam[0][0], depth, 0)
+
+        return None
+
+    def build_solution_path(self, initial_state, back_pointers, depth, index):
+        """Follow back pointers from board `index` at `depth` to the start."""
+        codes = []
+        while depth > 0:
+            pointer = back_pointers[depth][index]
+            codes.append(pointer & 3)
+            index = pointer >> 2
+            depth -= 1
+        codes.reverse()
+        return SolutionPath(initial_state, codes, self.h_delta, self.heuristic)
+
+    def display_solution(self, solution):
+        if solution is None:
+            print("No solution to print.")
+            return
+
+        print(f"\nBeam Solution found in {len(solution) - 1} moves:\n")
+        for i, state in enumerate(solution):
+            if state.move:
+                print(f"Move {i}: {state.move}")
+            else:
+                print(f"Initial State:")
+            state.display_board()
+            print()
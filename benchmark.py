@@ -0,0 +1,206 @@
+"""
+Reproducible solver benchmarks.
+
+The standard corpus is a seeded sample of solvable 3x3 boards,
+stratified by their optimal depth as read from the distance table, so
+the same seed always gives the same boards. Every algorithm runs on
+every board: `warmup` unmeasured solves, then `repetitions` timed solves
+and one extra solve under tracemalloc for the peak memory (tracing slows
+the search, so it is kept out of the timings). Each solve is capped by a
+time limit, and each record carries the solver's SearchStats from the
+last timed solve.
+
+Results are written as JSON: metadata, the corpus, one record per
+(algorithm, board) and a per-algorithm summary with medians and
+percentiles.
+
+Usage:
+    python benchmark.py [--algorithms astar,bfs] [--depths 4,8,12] [--per-depth 2]
+                        [--repetitions 3] [--warmup 1] [--time-limit 10]
+                        [--seed 2024] [--output results.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from puzzle_state import unpack_board
+from permutation_rank import STATE_COUNT, unrank
+from distance_table import UNREACHABLE, load_distance_table
+from search_control import SearchLimits
+from batch_solver import SOLVERS
+
+DEFAULT_SEED = 2024
+DEFAULT_DEPTHS = (4, 8, 12, 16, 20, 24, 28)
+
+CorpusBoard = namedtuple("CorpusBoard", ["board", "depth"])
+
+
+def standard_corpus(seed=DEFAULT_SEED, depths=DEFAULT_DEPTHS, per_depth=2):
+    """`per_depth` boards at each optimal depth in `depths`, drawn with a seeded RNG."""
+    table = load_distance_table()
+    entries = table[:]
+    for depth in depths:
+        available = sum(entries.count(depth << 2 | move_code) for move_code in range(4))
+        if available < per_depth:
+            raise ValueError(f"Only {available} boards have optimal depth {depth}, {per_depth} requested")
+    rng = random.Random(seed)
+    wanted = {depth: [] for depth in depths}
+    missing = len(wanted) * per_depth
+    while missing:
+        index = rng.randrange(STATE_COUNT)
+        entry = table[index]
+        if entry == UNREACHABLE:
+            continue
+        boards = wanted.get(entry >> 2)
+        if boards is not None and len(boards) < per_depth and index not in boards:
+            boards.append(index)
+            missing -= 1
+    return [CorpusBoard(unpack_board(unrank(index)), depth) for depth in depths for index in wanted[depth]]
+
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile of `values`, e.g. fraction=0.9 for p90."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _run_once(solver, board, limits):
+    """Solve and return (seconds, solution)."""
+    start = time.perf_counter()
+    solution = solver.solve(board, limits)
+    seconds = time.perf_counter() - start
+    return seconds, solution
+
+
+def benchmark_board(algorithm, board, repetitions=3, warmup=1, time_limit=10.0):
+    """Benchmark one algorithm on one board and return a result record."""
+    if repetitions < 1:
+        raise ValueError("repetitions must be at least 1")
+    solver = SOLVERS[algorithm]() if algorithm == "table" else SOLVERS[algorithm](size=len(board))
+    limits = SearchLimits(time_limit=time_limit)
+    for _ in range(warmup):
+        _run_once(solver, board, limits)
+
+    times = []
+    for _ in range(repetitions):
+        seconds, solution = _run_once(solver, board, limits)
+        times.append(seconds)
+    nodes_explored = solver.nodes_explored
+    stats = solver.stats.as_dict()
+    partial_result = getattr(solver, "partial_result", None)
+
+    tracemalloc.start()
+    try:
+        _run_once(solver, board, limits)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    median_time = percentile(times, 0.5)
+    return {
+        "algorithm": algorithm,
+        "solution_length": None if solution is None else len(solution) - 1,
+        "stopped": None if partial_result is None else partial_result.reason,
+        "nodes_explored": nodes_explored,
+        "visited_nodes": solver.visited_nodes,
+        "times": times,
+        "median_time": median_time,
+        "p90_time": percentile(times, 0.9),
+        "nodes_per_second": nodes_explored / median_time if median_time > 0 else None,
+        "peak_memory": peak_memory,
+        "stats": stats,
+    }
+
+
+def summarize(records):
+    """Per-algorithm summary over the corpus."""
+    summary = {}
+    for algorithm in dict.fromkeys(record["algorithm"] for record in records):
+        runs = [record for record in records if record["algorithm"] == algorithm]
+        solved = [record for record in runs if record["solution_length"] is not None]
+        rates = [record["nodes_per_second"] for record in runs if record["nodes_per_second"] is not None]
+        medians = [record["median_time"] for record in runs]
+        summary[algorithm] = {
+            "boards": len(runs),
+            "solved": len(solved),
+            "optimal": sum(record["solution_length"] == record["depth"] for record in solved),
+            "median_time": percentile(medians, 0.5),
+            "p90_time": percentile(medians, 0.9),
+            "total_nodes": sum(record["nodes_explored"] for record in runs),
+            "median_nodes_per_second": percentile(rates, 0.5) if rates else None,
+            "max_peak_memory": max(record["peak_memory"] for record in runs),
+        }
+    return summary
+
+
+def run_benchmark(algorithms=None, corpus=None, repetitions=3, warmup=1, time_limit=10.0, seed=DEFAULT_SEED):
+    """Benchmark `algorithms` (default: every solver) on `corpus` (default: the standard corpus)."""
+    if repetitions < 1:
+        raise ValueError("repetitions must be at least 1")
+    algorithms = list(algorithms or SOLVERS)
+    corpus = corpus if corpus is not None else standard_corpus(seed)
+    records = []
+    for algorithm in algorithms:
+        for board_index, (board, depth) in enumerate(corpus):
+            record = benchmark_board(algorithm, board, repetitions, warmup, time_limit)
+            record["board_index"] = board_index
+            record["depth"] = depth
+            records.append(record)
+    return {
+        "metadata": {
+            "seed": seed,
+            "repetitions": repetitions,
+            "warmup": warmup,
+            "time_limit": time_limit,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "corpus": [{"board": board, "depth": depth} for board, depth in corpus],
+        "results": records,
+        "summary": summarize(records),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the puzzle solvers on a seeded corpus.")
+    parser.add_argument("--algorithms", help=f"comma-separated subset of {','.join(SOLVERS)}")
+    parser.add_argument("--depths", default=",".join(map(str, DEFAULT_DEPTHS)), help="optimal depths to sample")
+    parser.add_argument("--per-depth", type=int, default=2, help="boards per depth")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds per solve")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", help="JSON file to write instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.repetitions < 1:
+        parser.error("--repetitions must be at least 1")
+    algorithms = args.algorithms.split(",") if args.algorithms else None
+    unknown = [algorithm for algorithm in algorithms or () if algorithm not in SOLVERS]
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(unknown)}")
+    depths = tuple(int(depth) for depth in args.depths.split(","))
+    corpus = standard_corpus(args.seed, depths, args.per_depth)
+    report = run_benchmark(algorithms, corpus, args.repetitions, args.warmup, args.time_limit, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"Benchmark results written to {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,119 @@
-from collections import deque
-from puzzle_state import PuzzleState
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, stop_search, run_search
+from successors import expand, move_tables, trace_moves, MOVE_CODES, MOVE_NAMES
+from permutation_rank import new_move_map
+from solution_path import SolutionPath
+
+ROOT_MOVE = len(MOVE_NAMES)  # Last move code of the start board in frontier entries
 
 
 class BFSSolver:
-    def __init__(self):
-        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    def __init__(self, size=3):
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.move_tables = move_tables(size)
         self.nodes_explored = 0
         self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
     
     def get_possible_moves(self, state):
-        neighbors = []
-        blank_row, blank_col = state.find_blank_position()
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-        
-        for dr, dc, move_name in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in state.board]
-                new_board[blank_row][blank_col], new_board[new_row][new_col] = new_board[new_row][new_col], new_board[blank_row][blank_col]
-                new_state = PuzzleState(board=new_board, g=state.g + 1, h=0, parent=state, move=move_name)
-                neighbors.append(new_state)
-        return neighbors
+        return expand(state)
+    
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
     
-    def solve(self, initial_board):
+    def solve(self, initial_board, limits=None):
+        """Shortest path to the goal, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
+    
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+    
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+        
+        stats = budget.stats
         initial_state = PuzzleState(board=initial_board, g=0, h=0)
-        goal = PuzzleState(board=self.goal_state)
-        queue = deque([initial_state])
-        visited = set()
-        visited.add(hash(initial_state))
+        goal_packed = PuzzleState(board=self.goal_state).packed
+        # Board -> code of the move that first reached it. This is both the
+        # visited set and the whole search tree, with no PuzzleState per node.
+        move_codes = new_move_map(self.size)
+        move_codes.visit(initial_state.packed, -1)
+        # One BFS layer, each board as a single int: packed << packed_shift | blank << 3 | last move code,
+        # where code ROOT_MOVE marks the start board and the blank field is wide enough for any cell
+        blank_bits = (self.size * self.size - 1).bit_length()
+        blank_mask = (1 << blank_bits) - 1
+        packed_shift = 3 + blank_bits
+        frontier = [initial_state.packed << packed_shift | initial_state.blank << 3 | ROOT_MOVE]
+        tables = self.move_tables
+        cell_mask = tables.cell_mask
+        cell_bits = tables.cell_bits
+        # blank -> last move code -> moves that do not undo it
+        pruned = [[by_last_move[move_name] for move_name in MOVE_NAMES + ("",)] for by_last_move in tables.pruned]
+        depth = 0
         self.nodes_explored = 0
         self.visited_nodes = 0
+        stats.phase("search")
         
-        while queue:
-            current = queue.popleft()
-            self.nodes_explored += 1
-            
-            if current == goal:
-                self.visited_nodes = len(visited)
-                print(f"BFS Solution found! Nodes explored: {self.nodes_explored}, Visited: {self.visited_nodes}")
-                return self.build_solution_path(current)
-            
-            for neighbor in self.get_possible_moves(current):
-                neighbor_hash = hash(neighbor)
-                if neighbor_hash not in visited:
-                    visited.add(neighbor_hash)
-                    queue.append(neighbor)
+        while frontier:
+            stats.max_depth = depth
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+            next_frontier = []
+            for entry in frontier:
+                packed = entry >> packed_shift
+                blank = (entry >> 3) & blank_mask
+                if self.nodes_explored >= budget.next_check:
+                    queued = len(frontier) + len(next_frontier)
+                    reason = budget.check(self.cancel_requested, self.nodes_explored, len(move_codes) + queued)
+                    if reason is not None:
+                        self.visited_nodes = len(move_codes)
+                        return stop_search(self, reason, budget, None, queued, depth)
+                    yield budget.progress(self.nodes_explored, queued, depth)
+                self.nodes_explored += 1
+                
+                if packed == goal_packed:
+                    self.visited_nodes = len(move_codes)
+                    stats.phase("path")
+                    return self.build_solution_path(initial_state, move_codes, packed, blank)
+                
+                blank_shift = blank * cell_bits
+                moves = pruned[blank][entry & 7]
+                stats.generated += len(moves)
+                for target, target_shift, move_name in moves:
+                    tile = (packed >> target_shift) & cell_mask
+                    child = packed ^ (tile << target_shift) | (tile << blank_shift)
+                    code = MOVE_CODES[move_name]
+                    if move_codes.visit(child, code):
+                        next_frontier.append(child << packed_shift | target << 3 | code)
+                    else:
+                        stats.duplicates += 1
+            frontier = next_frontier
+            depth += 1
         
-        self.visited_nodes = len(visited)
-        print(f"BFS: No solution found after exploring {self.nodes_explored} nodes.")
+        self.visited_nodes = len(move_codes)
         return None
     
-    def build_solution_path(self, state):
-        path = []
-        current = state
-        while current is not None:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
+    def build_solution_path(self, initial_state, move_codes, packed, blank):
+        """Read the path to a reached board back out of the move code map."""
+        return SolutionPath(initial_state, trace_moves(move_codes, packed, blank, self.size))
     
     def display_solution(self, solution):
         if solution is None:
@@ -0,0 +1,193 @@
+import heapq
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, stop_search, run_search
+from successors import expand, MOVE_CODES
+from solution_path import SolutionPath
+from heuristics import manhattan_tables, manhattan_tables_to, manhattan_distance
+
+
+class BidirectionalAStarSolver:
+    """
+    Bidirectional A* using the MM meet-in-the-middle rule.
+
+    One A* runs forward from the start with Manhattan distance to the goal,
+    another backward from the goal with Manhattan distance to the start.
+    Both order their open lists by max(f, 2g), so neither search goes past
+    the middle. Each generated board is checked against the other side to
+    keep the best path cost U, and the search stops once U is no larger
+    than the smallest priority on either open list, which makes U optimal.
+    """
+
+    FORWARD, BACKWARD = 0, 1
+
+    def __init__(self, size=3):
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.h_delta = manhattan_tables(size).delta
+        self.nodes_explored = 0
+        self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
+
+    def calculate_manhattan_distance(self, board):
+        return manhattan_distance(board)
+
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+
+    def solve(self, initial_board, limits=None):
+        """Shortest path to the goal, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
+
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+
+        stats = budget.stats
+        backward_tables = manhattan_tables_to(initial_board)
+        initial_state = PuzzleState(board=initial_board, g=0, h=self.calculate_manhattan_distance(initial_board))
+        goal = PuzzleState(board=self.goal_state, g=0)
+        goal.h = sum(backward_tables.table[goal.tile_at(index)][index] for index in range(self.size * self.size))
+        stats.heuristic_evaluations = 2
+        self.nodes_explored = 0
+        self.visited_nodes = 0
+
+        if initial_state == goal:
+            # Count the goal test on the start board as one expansion, like the other solvers
+            stats.phase("search")
+            self.nodes_explored = 1
+            self.visited_nodes = 1
+            stats.phase("path")
+            return SolutionPath(initial_state, b"", self.h_delta)
+
+        h_deltas = (self.h_delta, backward_tables.delta)
+        # Per direction: priority queue of (max(f, 2g), g, counter, state),
+        # best state found so far for every board, and boards already expanded
+        open_sets = ([], [])
+        best = ({initial_state.packed: initial_state}, {goal.packed: goal})
+        closed = (set(), set())
+        counter = 0
+        for side, root in ((self.FORWARD, initial_state), (self.BACKWARD, goal)):
+            heapq.heappush(open_sets[side], (max(root.total_cost, 2 * root.g), root.g, counter, root))
+            counter += 1
+
+        upper = None  # Cost of the best path found so far (U)
+        meet = None
+        stats.phase("search")
+
+        while True:
+            for side in (self.FORWARD, self.BACKWARD):
+                # Lazy deletion: drop entries superseded by a cheaper push or already expanded
+                open_set = open_sets[side]
+                while open_set and (best[side][open_set[0][3].packed] is not open_set[0][3]
+                                    or open_set[0][3].packed in closed[side]):
+                    heapq.heappop(open_set)
+            if not open_sets[self.FORWARD] or not open_sets[self.BACKWARD]:
+                break
+            if len(open_sets[self.FORWARD]) + len(open_sets[self.BACKWARD]) > stats.max_frontier:
+                stats.max_frontier = len(open_sets[self.FORWARD]) + len(open_sets[self.BACKWARD])
+
+            forward_priority = open_sets[self.FORWARD][0][0]
+            backward_priority = open_sets[self.BACKWARD][0][0]
+            if upper is not None and upper <= min(forward_priority, backward_priority):
+                break
+
+            if forward_priority < backward_priority:
+                side = self.FORWARD
+            elif backward_priority < forward_priority:
+                side = self.BACKWARD
+            else:
+                side = self.FORWARD if len(open_sets[self.FORWARD]) <= len(open_sets[self.BACKWARD]) else self.BACKWARD
+
+            _, _, _, current = heapq.heappop(open_sets[side])
+            closed[side].add(current.packed)
+            if self.nodes_explored >= budget.next_check:
+                stored_nodes = len(best[self.FORWARD]) + len(best[self.BACKWARD])
+                reason = budget.check(self.cancel_requested, self.nodes_explored, stored_nodes)
+                if reason is not None:
+                    self.visited_nodes = stored_nodes
+                    # Any meeting found so far is a complete, if not yet proven optimal, path
+                    best_path = None if meet is None else self._reconstruct_bidirectional_path(initial_state, *meet)
+                    return stop_search(self, reason, budget, best_path,
+                                       len(open_sets[self.FORWARD]) + len(open_sets[self.BACKWARD]),
+                                       min(forward_priority, backward_priority))
+                yield budget.progress(self.nodes_explored, len(open_sets[self.FORWARD]) + len(open_sets[self.BACKWARD]),
+                                      min(forward_priority, backward_priority))
+            self.nodes_explored += 1
+            if current.g > stats.max_depth:
+                stats.max_depth = current.g
+            other_best = best[1 - side]
+
+            neighbors = expand(current, h_deltas[side])
+            stats.generated += len(neighbors)
+            stats.heuristic_evaluations += len(neighbors)
+            for neighbor in neighbors:
+                known = best[side].get(neighbor.packed)
+                if known is not None and known.g <= neighbor.g:
+                    stats.duplicates += 1
+                    continue
+                best[side][neighbor.packed] = neighbor
+                closed[side].discard(neighbor.packed)  # Reopen if it was expanded with a worse g
+                heapq.heappush(open_sets[side], (max(neighbor.total_cost, 2 * neighbor.g), neighbor.g, counter, neighbor))
+                counter += 1
+
+                other = other_best.get(neighbor.packed)
+                if other is not None and (upper is None or neighbor.g + other.g < upper):
+                    upper = neighbor.g + other.g
+                    meet = (neighbor, other) if side == self.FORWARD else (other, neighbor)
+
+        self.visited_nodes = len(best[self.FORWARD]) + len(best[self.BACKWARD])
+        if meet is None:
+            return None
+
+        stats.phase("path")
+        return self._reconstruct_bidirectional_path(initial_state, *meet)
+
+    def _reconstruct_bidirectional_path(self, initial_state, forward_state, backward_state):
+        """Join the two half paths at the meeting board."""
+        moves = []
+        current = forward_state
+        while current.parent is not None:
+            moves.append(MOVE_CODES[current.move])
+            current = current.parent
+        moves.reverse()
+
+        # The backward half was searched from the goal, so replay it reversed
+        current = backward_state
+        while current.parent is not None:
+            moves.append(MOVE_CODES[current.move] ^ 1)
+            current = current.parent
+
+        return SolutionPath(initial_state, moves, self.h_delta)
+
+    def display_solution(self, solution):
+        if solution is None:
+            print("No solution to print.")
+            return
+
+        print(f"\nBidirectional A* Solution found in {len(solution) - 1} moves:\n")
+        for i, state in enumerate(solution):
+            if state.move:
+                print(f"Move {i}: {state.move}")
+            else:
+                print(f"Initial State:")
+            state.display_board()
+            print()
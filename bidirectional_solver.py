@@ -1,115 +1,142 @@
-from collections import deque
-from puzzle_state import PuzzleState
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, SearchStopped, stop_search, run_search
+from successors import expand, move_tables, trace_moves, MOVE_CODES
+from solution_path import SolutionPath
 
 
 class BidirectionalSolver:
-    def __init__(self):
-        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    def __init__(self, size=3):
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.move_tables = move_tables(size)
         self.nodes_explored = 0
         self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
     
     def get_possible_moves(self, state):
-        neighbors = []
-        blank_row, blank_col = state.find_blank_position()
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-        
-        for dr, dc, move_name in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in state.board]
-                new_board[blank_row][blank_col], new_board[new_row][new_col] = new_board[new_row][new_col], new_board[blank_row][blank_col]
-                new_state = PuzzleState(board=new_board, g=state.g + 1, h=0, parent=state, move=move_name)
-                neighbors.append(new_state)
-        return neighbors
+        return expand(state)
+    
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+    
+    def solve(self, initial_board, limits=None):
+        """Shortest path to the goal, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
     
-    def solve(self, initial_board):
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+    
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+        
+        stats = budget.stats
         initial_state = PuzzleState(board=initial_board, g=0, h=0)
         goal = PuzzleState(board=self.goal_state)
-        
-        # Forward search from initial state
-        forward_queue = deque([initial_state])
-        forward_visited = {hash(initial_state): initial_state}
-        
-        # Backward search from goal state
-        backward_queue = deque([goal])
-        backward_visited = {hash(goal): goal}
-        
         self.nodes_explored = 0
         self.visited_nodes = 0
         
-        while forward_queue and backward_queue:
-            # Expand forward
-            if forward_queue:
-                current_forward = forward_queue.popleft()
-                self.nodes_explored += 1
-                
-                # Check if this state was visited from backward
-                current_hash = hash(current_forward)
-                if current_hash in backward_visited:
-                    # Found intersection - reconstruct path
-                    backward_state = backward_visited[current_hash]
-                    solution = self._reconstruct_bidirectional_path(current_forward, backward_state)
-                    self.visited_nodes = len(forward_visited) + len(backward_visited)
-                    print(f"Bidirectional Solution found! Nodes explored: {self.nodes_explored}, Visited: {self.visited_nodes}")
-                    return solution
-                
-                for neighbor in self.get_possible_moves(current_forward):
-                    neighbor_hash = hash(neighbor)
-                    if neighbor_hash not in forward_visited:
-                        forward_visited[neighbor_hash] = neighbor
-                        forward_queue.append(neighbor)
+        if initial_state == goal:
+            # Count the goal test on the start board as one expansion, like the other solvers
+            stats.phase("search")
+            self.nodes_explored = 1
+            self.visited_nodes = 1
+            stats.phase("path")
+            return SolutionPath(initial_state)
+        
+        # Visited maps: packed board -> code of the move that reached it (-1 for the root)
+        forward_visited = {initial_state.packed: -1}
+        backward_visited = {goal.packed: -1}
+        # Frontiers hold one whole BFS layer: (packed, blank, last move name)
+        forward_frontier = [(initial_state.packed, initial_state.blank, "")]
+        backward_frontier = [(goal.packed, goal.blank, "")]
+        depth = 0  # Layers expanded on both sides together
+        forward_depth = backward_depth = 0  # Layers expanded on each side
+        stats.phase("search")
+        
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) + len(backward_frontier) > stats.max_frontier:
+                stats.max_frontier = len(forward_frontier) + len(backward_frontier)
+            # Expand the smaller frontier by one full layer
+            try:
+                if len(forward_frontier) <= len(backward_frontier):
+                    stats.max_depth = max(stats.max_depth, forward_depth)
+                    forward_frontier, meet = yield from self._expand_layer(forward_frontier, forward_visited, backward_visited, budget)
+                    forward_depth += 1
+                else:
+                    stats.max_depth = max(stats.max_depth, backward_depth)
+                    backward_frontier, meet = yield from self._expand_layer(backward_frontier, backward_visited, forward_visited, budget)
+                    backward_depth += 1
+            except SearchStopped as stopped:
+                self.visited_nodes = len(forward_visited) + len(backward_visited)
+                return stop_search(self, stopped.reason, budget, None,
+                                   len(forward_frontier) + len(backward_frontier), depth)
+            depth += 1
             
-            # Expand backward
-            if backward_queue:
-                current_backward = backward_queue.popleft()
-                self.nodes_explored += 1
-                
-                # Check if this state was visited from forward
-                current_hash = hash(current_backward)
-                if current_hash in forward_visited:
-                    # Found intersection - reconstruct path
-                    forward_state = forward_visited[current_hash]
-                    solution = self._reconstruct_bidirectional_path(forward_state, current_backward)
-                    self.visited_nodes = len(forward_visited) + len(backward_visited)
-                    print(f"Bidirectional Solution found! Nodes explored: {self.nodes_explored}, Visited: {self.visited_nodes}")
-                    return solution
-                
-                for neighbor in self.get_possible_moves(current_backward):
-                    neighbor_hash = hash(neighbor)
-                    if neighbor_hash not in backward_visited:
-                        backward_visited[neighbor_hash] = neighbor
-                        backward_queue.append(neighbor)
+            if meet is not None:
+                # Layers are complete when the first meet is seen, so it lies on a shortest path
+                packed, blank = meet
+                stats.phase("path")
+                moves = trace_moves(forward_visited, packed, blank, self.size)
+                moves += [code ^ 1 for code in reversed(trace_moves(backward_visited, packed, blank, self.size))]
+                self.visited_nodes = len(forward_visited) + len(backward_visited)
+                return SolutionPath(initial_state, moves)
         
         self.visited_nodes = len(forward_visited) + len(backward_visited)
-        print(f"Bidirectional: No solution found after exploring {self.nodes_explored} nodes.")
         return None
     
-    def _reconstruct_bidirectional_path(self, forward_state, backward_state):
-        """Reconstruct path from forward and backward meeting point."""
-        # Build forward path
-        forward_path = []
-        current = forward_state
-        while current is not None:
-            forward_path.append(current)
-            current = current.parent
-        forward_path.reverse()
-        
-        # Build backward path (skip first as it's duplicate)
-        backward_path = []
-        current = backward_state.parent
-        while current is not None:
-            backward_path.append(current)
-            current = current.parent
-        
-        return forward_path + backward_path
+    def _expand_layer(self, frontier, visited, other_visited, budget):
+        """
+        Expand every board in `frontier` and return (next layer, meet),
+        where meet is the (packed, blank) of the first child already seen
+        by the other search, or None. Yields progress snapshots on the way.
+        """
+        tables = self.move_tables
+        cell_mask = tables.cell_mask
+        cell_bits = tables.cell_bits
+        stats = budget.stats
+        next_frontier = []
+        for packed, blank, last_move in frontier:
+            if self.nodes_explored >= budget.next_check:
+                reason = budget.check(self.cancel_requested, self.nodes_explored,
+                                      len(visited) + len(other_visited))
+                if reason is not None:
+                    raise SearchStopped(reason)
+                yield budget.progress(self.nodes_explored, len(frontier) + len(next_frontier))
+            self.nodes_explored += 1
+            blank_shift = blank * cell_bits
+            moves = tables.pruned[blank][last_move]
+            stats.generated += len(moves)
+            for target, target_shift, move_name in moves:
+                tile = (packed >> target_shift) & cell_mask
+                child = packed ^ (tile << target_shift) | (tile << blank_shift)
+                if child in visited:
+                    stats.duplicates += 1
+                    continue
+                visited[child] = MOVE_CODES[move_name]
+                if child in other_visited:
+                    return next_frontier, (child, target)
+                next_frontier.append((child, target, move_name))
+        return next_frontier, None
     
     def build_solution_path(self, state):
-        path = []
-        current = state
-        while current is not None:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
+        return SolutionPath.from_state(state)
     
     def display_solution(self, solution):
         if solution is None:
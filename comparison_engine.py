@@ -0,0 +1,84 @@
+"""
+Parallel algorithm comparisons on a process pool.
+
+Every (algorithm, board) pair is one task. Workers receive the board as
+its packed integer and send back a ComparisonResult holding the solution
+as a bytes string of move codes (SolutionPath.moves) instead of pickled
+states; materialize() turns it back into a SolutionPath on the caller's
+side, e.g. for visualization.
+
+Each solve runs under a SearchLimits time limit, COMPARE_TIME_LIMIT by
+default, so a blind search such as DFS or IDDFS on a deep board cannot
+hold up the whole comparison; its result then has no moves and the limit
+that stopped it in `stopped`.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from puzzle_state import BOARD_SIZE, PuzzleState, unpack_board
+from solution_path import SolutionPath
+from heuristics import manhattan_tables, manhattan_distance
+from search_control import SearchLimits
+from batch_solver import SOLVERS
+
+# Algorithms compared by default, in display order
+COMPARE_ALGORITHMS = ("astar", "bfs", "dfs", "bidirectional", "iddfs", "greedy", "idastar", "bidirectional_astar", "beam")
+COMPARE_TIME_LIMIT = 20.0  # Seconds per solve
+
+# stopped is the PartialResult reason when a limit stopped the search, else None
+
+ComparisonResult = namedtuple("ComparisonResult", ["algorithm", "board_index", "packed", "size", "moves",
+                                                   "nodes_explored", "visited_nodes", "max_depth", "stats",
+                                                   "stopped"], defaults=(None,))
+
+
+def run_algorithm(algorithm, board_index, packed, size=BOARD_SIZE, time_limit=COMPARE_TIME_LIMIT):
+    """Worker entry point: solve one packed board with one algorithm within `time_limit` seconds."""
+    solver = SOLVERS[algorithm]() if algorithm == "table" else SOLVERS[algorithm](size=size)
+    solution = solver.solve(unpack_board(packed, size), SearchLimits(time_limit=time_limit))
+    moves = None
+    if solution is not None:
+        moves = solution.moves
+    stopped = None if solver.partial_result is None else solver.partial_result.reason
+    return ComparisonResult(algorithm, board_index, packed, size, moves, solver.nodes_explored,
+                            solver.visited_nodes, getattr(solver, "max_depth", None), solver.stats, stopped)
+
+
+def materialize(result):
+    """SolutionPath for a result, with Manhattan g/h on its states, or None without a solution."""
+    if result.moves is None:
+        return None
+    board = unpack_board(result.packed, result.size)
+    initial_state = PuzzleState(board=board, g=0, h=manhattan_distance(board))
+    return SolutionPath(initial_state, result.moves, manhattan_tables(result.size).delta)
+
+
+class ComparisonEngine:
+    """Process pool that runs algorithm comparisons for many boards at once."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self.executor = None
+
+    def submit(self, boards, algorithms=COMPARE_ALGORITHMS, time_limit=COMPARE_TIME_LIMIT):
+        """Queue every algorithm on every board, each limited to `time_limit` seconds, and return the futures."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        for board_index, board in enumerate(boards):
+            packed = PuzzleState(board=board).packed
+            for algorithm in algorithms:
+                futures.append(self.executor.submit(run_algorithm, algorithm, board_index, packed, len(board),
+                                                     time_limit))
+        return futures
+
+    def compare(self, boards, algorithms=COMPARE_ALGORITHMS, time_limit=COMPARE_TIME_LIMIT):
+        """Yield ComparisonResults in completion order."""
+        for future in as_completed(self.submit(boards, algorithms, time_limit)):
+            yield future.result()
+
+    def shutdown(self, wait=True):
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+            self.executor = None
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from astar_solver import AStarSolver
@@ -10,16 +11,54 @@ from dfs_solver import DFSSolver
 from bidirectional_solver import BidirectionalSolver
 from iddfs_solver import IDDFSSolver
 from greedy_solver import GreedySolver
+from idastar_solver import IDAStarSolver
+from bidirectional_astar_solver import BidirectionalAStarSolver
+from beam_solver import BeamSolver
 from puzzle_state import PuzzleState
+from solvability import check_solvability
+from comparison_engine import ComparisonEngine, materialize
+from profiling import PROFILE_MODES, SolverProfiler, format_report
+from solution_cache import CachedSolver, SolutionCache
 from design.visualizer import PuzzleSolutionVisualizer
 
+COMPARISON_POLL_MS = 50
+SOLVE_SLICE_MS = 50  # Search time per main-loop turn while solving
+
+# Display name and color of each compared algorithm
+COMPARISON_NAMES = {
+    "astar": "A* Search",
+    "bfs": "BFS",
+    "dfs": "DFS",
+    "bidirectional": "Bidirectional",
+    "iddfs": "IDDFS",
+    "greedy": "Greedy",
+    "idastar": "IDA* Search",
+    "bidirectional_astar": "Bidirectional A*",
+    "beam": "Beam Search",
+}
+COMPARISON_COLORS = {
+    "astar": "#0d7377",
+    "bfs": "#ff6b6b",
+    "dfs": "#14cc60",
+    "bidirectional": "#9b59b6",
+    "iddfs": "#f39c12",
+    "greedy": "#e91e63",
+    "idastar": "#1abc9c",
+    "bidirectional_astar": "#3498db",
+    "beam": "#e67e22",
+}
+
 
 class PuzzleSolverGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("8-Puzzle Solver - AI Search Algorithms")
-        self.root.geometry("800x800")
+        self.root.geometry("800x850")
         self.root.configure(bg='#1e1e1e')
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.comparison_engine = ComparisonEngine()
+        self.active_job = None  # Solve in progress, see solve_puzzle
+        self.solution_cache = SolutionCache()  # Repeat solves of a board (e.g. the presets) skip the search
         
         # Dark mode color scheme
         self.bg_dark = '#1e1e1e'
@@ -34,6 +73,7 @@ class PuzzleSolverGUI:
         
         # Variables
         self.algorithm_var = tk.StringVar(value="astar")
+        self.profile_mode_var = tk.StringVar(value=PROFILE_MODES[0])
         self.board_entries = []
         
         # Create main container with padding
@@ -163,7 +203,10 @@ class PuzzleSolverGUI:
             ("DFS (Depth-First Search)", "dfs", "#14cc60"),
             ("Bidirectional Search (Dual BFS)", "bidirectional", "#9b59b6"),
             ("IDDFS (Iterative Deepening DFS)", "iddfs", "#f39c12"),
-            ("GBFS (Greedy Best-First Search)", "greedy", "#e91e63")
+            ("GBFS (Greedy Best-First Search)", "greedy", "#e91e63"),
+            ("IDA* (Iterative Deepening A*)", "idastar", "#1abc9c"),
+            ("Bidirectional A* (MM)", "bidirectional_astar", "#3498db"),
+            ("Beam Search (Bounded Memory)", "beam", "#e67e22")
         ]
         
         # Create two-column layout
@@ -176,9 +219,10 @@ class PuzzleSolverGUI:
         right_column = tk.Frame(columns_frame, bg=self.bg_medium)
         right_column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Place 3 algorithms in each column
+        # Split algorithms evenly between the columns
+        left_count = (len(algorithms) + 1) // 2
         for idx, (text, value, color) in enumerate(algorithms):
-            parent = left_column if idx < 3 else right_column
+            parent = left_column if idx < left_count else right_column
             rb = tk.Radiobutton(parent,
                                text=text,
                                variable=self.algorithm_var,
@@ -225,6 +269,42 @@ class PuzzleSolverGUI:
                                   borderwidth=3)
         compare_button.pack(side=tk.LEFT, padx=10)
         
+        self.cancel_button = tk.Button(button_frame,
+                                       text="✖ CANCEL",
+                                       command=self.cancel_solve,
+                                       font=('Arial', 14, 'bold'),
+                                       bg=self.accent_red,
+                                       fg='white',
+                                       padx=30,
+                                       pady=15,
+                                       cursor='hand2',
+                                       relief=tk.RAISED,
+                                       borderwidth=3,
+                                       state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=10)
+        
+        # Profiling: runs the selected algorithm instrumented and shows where the time went
+        profile_frame = tk.Frame(main_container, bg=self.bg_dark)
+        profile_frame.pack()
+        
+        self.profile_button = tk.Button(profile_frame,
+                                        text="⏱ PROFILE",
+                                        command=self.profile_puzzle,
+                                        font=('Arial', 11, 'bold'),
+                                        bg=self.accent_orange,
+                                        fg='white',
+                                        padx=20,
+                                        pady=8,
+                                        cursor='hand2',
+                                        relief=tk.RAISED,
+                                        borderwidth=2)
+        self.profile_button.pack(side=tk.LEFT, padx=10)
+        
+        profile_mode_menu = tk.OptionMenu(profile_frame, self.profile_mode_var, *PROFILE_MODES)
+        profile_mode_menu.config(font=('Arial', 10), bg=self.bg_medium, fg=self.fg_primary,
+                                 activebackground=self.bg_light, highlightthickness=0)
+        profile_mode_menu.pack(side=tk.LEFT, padx=10)
+        
         # Status Label
         self.status_label = tk.Label(main_container,
                                      text="Ready to solve!",
@@ -297,16 +377,27 @@ class PuzzleSolverGUI:
             messagebox.showerror("Error", "Please enter valid numbers!")
             return None
     
-    def solve_puzzle(self):
-        """Solve the puzzle with selected algorithm."""
+    def check_board_solvable(self, board):
+        """Reject boards with the wrong permutation parity before any search runs."""
+        solvability = check_solvability(board)
+        if not solvability.solvable:
+            messagebox.showwarning("Unsolvable Puzzle", f"{solvability.reason}.\nNo search was run.")
+            self.status_label.config(text="Puzzle is unsolvable")
+            return False
+        return True
+    
+    def profile_puzzle(self):
+        """Solve with the selected algorithm under the selected profiler and show the profile."""
+        self.solve_puzzle(profile_mode=self.profile_mode_var.get())
+    
+    def solve_puzzle(self, profile_mode=None):
+        """Solve the puzzle with selected algorithm, profiled when `profile_mode` is given."""
         board = self.get_board()
-        if board is None:
+        if board is None or not self.check_board_solvable(board):
             return
         
         algorithm = self.algorithm_var.get()
         self.status_label.config(text=f"Solving with {algorithm.upper()}...")
-        self.solve_button.config(state='disabled')
-        self.root.update()
         
         try:
             # Map algorithm names to colors and max_depth
@@ -316,7 +407,10 @@ class PuzzleSolverGUI:
                 "dfs": {"name": "DFS", "color": "#2ecc71", "max_depth": None},
                 "bidirectional": {"name": "Bidirectional Search", "color": "#9b59b6", "max_depth": None},
                 "iddfs": {"name": "IDDFS", "color": "#f39c12", "max_depth": None},
-                "greedy": {"name": "Greedy Best-First", "color": "#e91e63", "max_depth": None}
+                "greedy": {"name": "Greedy Best-First", "color": "#e91e63", "max_depth": None},
+                "idastar": {"name": "IDA* Search", "color": "#1abc9c", "max_depth": None},
+                "bidirectional_astar": {"name": "Bidirectional A*", "color": "#3498db", "max_depth": None},
+                "beam": {"name": "Beam Search", "color": "#e67e22", "max_depth": None}
             }
             
             if algorithm == "astar":
@@ -339,153 +433,203 @@ class PuzzleSolverGUI:
             elif algorithm == "greedy":
                 solver = GreedySolver()
                 self.status_label.config(text="Running Greedy Best-First Search...")
+            elif algorithm == "idastar":
+                solver = IDAStarSolver()
+                self.status_label.config(text="Running IDA* Search...")
+            elif algorithm == "bidirectional_astar":
+                solver = BidirectionalAStarSolver()
+                self.status_label.config(text="Running Bidirectional A* Search...")
+            elif algorithm == "beam":
+                solver = BeamSolver()
+                self.status_label.config(text="Running Beam Search...")
+                algo_config["beam"]["max_depth"] = solver.max_depth
             
-            solution = solver.solve(board)
-            
-            if solution:
-                moves = len(solution) - 1
-                nodes = solver.nodes_explored
-                visited = getattr(solver, 'visited_nodes', nodes)
-                self.status_label.config(
-                    text=f"Solution found! Visited nodes: {visited}, Steps: {moves}"
-                )
-                # Show visualization using shared visualizer
-                config = algo_config[algorithm]
-                visualizer = PuzzleSolutionVisualizer(
-                    algorithm_name=config["name"],
-                    algorithm_color=config["color"],
-                    nodes_explored=nodes,
-                    visited_nodes=visited,
-                    max_depth=config["max_depth"],
-                    parent=self.root  # Pass parent window
-                )
-                visualizer.visualize(solution)
+            profiler = None
+            if profile_mode is not None:
+                profiler = SolverProfiler(solver, profile_mode)
+                profiler.start()
+                profiler.pause()
             else:
-                messagebox.showwarning("No Solution", "No solution found for this puzzle!")
-                self.status_label.config(text="No solution found")
+                # Profiled runs always search, since a cached answer has nothing to profile
+                solver = CachedSolver(solver, self.solution_cache, algorithm)
+            
+            self.solve_button.config(state='disabled')
+            self.profile_button.config(state='disabled')
+            self.cancel_button.config(state='normal')
+            job = {
+                'solver': solver,
+                'search': solver.solve_iter(board),
+                'profiler': profiler,
+                'config': algo_config[algorithm],
+                'status': self.status_label.cget('text').rstrip('.'),
+                'solution': None,
+                'error': None,
+                'cancel': False,
+                'start': time.perf_counter()
+            }
+            self.active_job = job
+            self.root.after(1, self._step_solve, job)
         
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             self.status_label.config(text="Error occurred")
-        
-        finally:
             self.solve_button.config(state='normal')
+            self.profile_button.config(state='normal')
+            self.cancel_button.config(state='disabled')
+    
+    def _step_solve(self, job):
+        """Run the search for one time slice, show its progress, and handle its result once it ends."""
+        solver = job['solver']
+        if job['cancel'] and not solver.cancel_requested:
+            # Cancel arrived before the search started and reset the flag
+            solver.cancel()
+        profiler = job['profiler']
+        slice_end = time.perf_counter() + SOLVE_SLICE_MS / 1000
+        done = False
+        if profiler is not None:
+            profiler.resume()
+        try:
+            for progress in job['search']:
+                if progress.done:
+                    job['solution'] = progress.solution
+                    done = True
+                    break
+                if time.perf_counter() >= slice_end:
+                    break
+        except Exception as e:
+            job['error'] = e
+            done = True
+        if profiler is not None:
+            profiler.pause()
+        elapsed = time.perf_counter() - job['start']
+        if not done:
+            self.status_label.config(
+                text=f"{job['status']}... {progress.nodes_explored:,} nodes, {elapsed:.1f}s"
+            )
+            # Hand the main loop back before the next slice so the window stays responsive
+            self.root.after(1, self._step_solve, job)
+            return
+        
+        self.active_job = None
+        self.solve_button.config(state='normal')
+        self.profile_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        solution = job['solution']
+        # Always stop the profiler, so its instrumentation is removed even after an error
+        report = profiler.stop(solution) if profiler is not None else None
+        
+        if job['error'] is not None:
+            messagebox.showerror("Error", f"An error occurred: {str(job['error'])}")
+            self.status_label.config(text="Error occurred")
+        elif solver.cancelled or job['cancel']:
+            self.status_label.config(
+                text=f"Search cancelled after {solver.nodes_explored:,} nodes, {elapsed:.1f}s"
+            )
+        elif report is not None:
+            self.status_label.config(text=f"Profiled {job['config']['name']} in {report.seconds:.2f}s")
+            self.show_profile_window(report, job['config'])
+        elif solution:
+            moves = len(solution) - 1
+            nodes = solver.nodes_explored
+            visited = getattr(solver, 'visited_nodes', nodes)
+            self.status_label.config(
+                text=f"Solution found! Visited nodes: {visited}, Steps: {moves}"
+            )
+            # Show visualization using shared visualizer
+            config = job['config']
+            visualizer = PuzzleSolutionVisualizer(
+                algorithm_name=config["name"],
+                algorithm_color=config["color"],
+                nodes_explored=nodes,
+                visited_nodes=visited,
+                max_depth=config["max_depth"],
+                parent=self.root,  # Pass parent window
+                stats=getattr(solver, 'stats', None)
+            )
+            visualizer.visualize(solution)
+        else:
+            messagebox.showwarning("No Solution", "No solution found for this puzzle!")
+            self.status_label.config(text="No solution found")
+    
+    def cancel_solve(self):
+        """Stop the running solve at its next cancellation check."""
+        if self.active_job is None:
+            return
+        self.active_job['cancel'] = True
+        self.active_job['solver'].cancel()
+        self.status_label.config(text="Cancelling...")
     
     def compare_all(self):
-        """Compare all three algorithms."""
+        """Compare all algorithms, each in its own worker process."""
         board = self.get_board()
-        if board is None:
+        if board is None or not self.check_board_solvable(board):
             return
         
         self.status_label.config(text="Running all algorithms...")
         self.root.update()
         
-        results = []
-        
         try:
-            # A* Search
-            self.status_label.config(text="Running A* Search...")
-            self.root.update()
-            astar_solver = AStarSolver()
-            astar_solution = astar_solver.solve(board)
-            if astar_solution:
-                results.append({
-                    'name': 'A* Search',
-                    'moves': len(astar_solution) - 1,
-                    'nodes': astar_solver.nodes_explored,
-                    'visited': getattr(astar_solver, 'visited_nodes', astar_solver.nodes_explored),
-                    'solver': astar_solver,
-                    'solution': astar_solution
-                })
-            
-            # BFS
-            self.status_label.config(text="Running BFS...")
-            self.root.update()
-            bfs_solver = BFSSolver()
-            bfs_solution = bfs_solver.solve(board)
-            if bfs_solution:
-                results.append({
-                    'name': 'BFS',
-                    'moves': len(bfs_solution) - 1,
-                    'nodes': bfs_solver.nodes_explored,
-                    'visited': getattr(bfs_solver, 'visited_nodes', bfs_solver.nodes_explored),
-                    'solver': bfs_solver,
-                    'solution': bfs_solution
-                })
-            
-            # DFS
-            self.status_label.config(text="Running DFS...")
-            self.root.update()
-            dfs_solver = DFSSolver()
-            dfs_solution = dfs_solver.solve(board)
-            if dfs_solution:
-                results.append({
-                    'name': 'DFS',
-                    'moves': len(dfs_solution) - 1,
-                    'nodes': dfs_solver.nodes_explored,
-                    'visited': getattr(dfs_solver, 'visited_nodes', dfs_solver.nodes_explored),
-                    'solver': dfs_solver,
-                    'solution': dfs_solution
-                })
-            
-            # Bidirectional Search
-            self.status_label.config(text="Running Bidirectional Search...")
-            self.root.update()
-            bidirectional_solver = BidirectionalSolver()
-            bidirectional_solution = bidirectional_solver.solve(board)
-            if bidirectional_solution:
-                results.append({
-                    'name': 'Bidirectional',
-                    'moves': len(bidirectional_solution) - 1,
-                    'nodes': bidirectional_solver.nodes_explored,
-                    'visited': getattr(bidirectional_solver, 'visited_nodes', bidirectional_solver.nodes_explored),
-                    'solver': bidirectional_solver,
-                    'solution': bidirectional_solution
-                })
-            
-            # IDDFS
-            self.status_label.config(text="Running IDDFS...")
-            self.root.update()
-            iddfs_solver = IDDFSSolver()
-            iddfs_solution = iddfs_solver.solve(board)
-            if iddfs_solution:
-                results.append({
-                    'name': 'IDDFS',
-                    'moves': len(iddfs_solution) - 1,
-                    'nodes': iddfs_solver.nodes_explored,
-                    'visited': getattr(iddfs_solver, 'visited_nodes', iddfs_solver.nodes_explored),
-                    'solver': iddfs_solver,
-                    'solution': iddfs_solution
-                })
-            
-            # Greedy Best-First Search
-            self.status_label.config(text="Running Greedy Best-First Search...")
-            self.root.update()
-            greedy_solver = GreedySolver()
-            greedy_solution = greedy_solver.solve(board)
-            if greedy_solution:
-                results.append({
-                    'name': 'Greedy',
-                    'moves': len(greedy_solution) - 1,
-                    'nodes': greedy_solver.nodes_explored,
-                    'visited': getattr(greedy_solver, 'visited_nodes', greedy_solver.nodes_explored),
-                    'solver': greedy_solver,
-                    'solution': greedy_solution
-                })
-            
-            if results:
-                self.show_comparison_window(results)
-                self.status_label.config(text="Comparison complete!")
-            else:
-                messagebox.showwarning("No Solution", "No algorithm found a solution!")
-                self.status_label.config(text="No solutions found")
-        
+            futures = self.comparison_engine.submit([board])
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             self.status_label.config(text="Error occurred")
+            return
+        
+        add_result = self.show_comparison_window([])
+        self.root.after(COMPARISON_POLL_MS, self._poll_comparison, futures, add_result, 0)
+    
+    def _poll_comparison(self, futures, add_result, found):
+        """Add finished comparison results to the window without blocking the main loop."""
+        pending = []
+        for future in futures:
+            if not future.done():
+                pending.append(future)
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                messagebox.showerror("Error", f"An error occurred: {str(e)}")
+                self.status_label.config(text="Error occurred")
+                continue
+            if result.stopped is not None:
+                add_result({
+                    'name': COMPARISON_NAMES[result.algorithm],
+                    'color': COMPARISON_COLORS[result.algorithm],
+                    'moves': None,
+                    'stopped': result.stopped,
+                    'nodes': result.nodes_explored,
+                    'visited': result.visited_nodes,
+                    'max_depth': result.max_depth,
+                    'stats': result.stats,
+                    'solution': None
+                })
+            elif result.moves is not None:
+                found += 1
+                add_result({
+                    'name': COMPARISON_NAMES[result.algorithm],
+                    'color': COMPARISON_COLORS[result.algorithm],
+                    'moves': len(result.moves),
+                    'nodes': result.nodes_explored,
+                    'visited': result.visited_nodes,
+                    'max_depth': result.max_depth,
+                    'stats': result.stats,
+                    'solution': materialize(result)
+                })
+        
+        if pending:
+            self.status_label.config(text=f"Running all algorithms... {len(futures) - len(pending)} done")
+            self.root.after(COMPARISON_POLL_MS, self._poll_comparison, pending, add_result, found)
+        elif found:
+            self.status_label.config(text="Comparison complete!")
+        else:
+            messagebox.showwarning("No Solution", "No algorithm found a solution!")
+            self.status_label.config(text="No solutions found")
     
     def show_comparison_window(self, results):
-        """Show comparison results in a new window."""
+        """
+        Show comparison results in a new window. Returns a function that
+        adds one more result row, so results can be shown as they arrive.
+        """
         comp_window = tk.Toplevel(self.root)
         comp_window.title("Algorithm Comparison Results")
         comp_window.geometry("900x700")
@@ -505,7 +649,6 @@ class PuzzleSolverGUI:
         
         # Headers
         headers = ['Algorithm', 'Moves', 'Visited Nodes', 'Number of Steps']
-        colors = ['#0d7377', '#ff6b6b', '#14cc60', '#9b59b6', '#f39c12', '#e91e63']
         
         # Define fixed column widths
         col_widths = [150, 100, 150, 150]  # pixels for each column
@@ -524,23 +667,62 @@ class PuzzleSolverGUI:
                            anchor='center')
             label.grid(row=0, column=col, sticky='ew', padx=2, pady=2)
         
-        # Results data
-        for idx, result in enumerate(results):
+        # Configure grid weights
+        for col in range(4):
+            results_frame.grid_columnconfigure(col, weight=1)
+        
+        # Visualization buttons
+        viz_frame = tk.Frame(comp_window, bg=self.bg_dark)
+        viz_frame.pack(pady=20)
+        
+        tk.Label(viz_frame,
+                text="View Visualization:",
+                font=('Arial', 11, 'bold'),
+                bg=self.bg_dark,
+                fg=self.fg_primary).pack(pady=(0, 10))
+        
+        button_container = tk.Frame(viz_frame, bg=self.bg_dark)
+        button_container.pack()
+        
+        # Create visualization function with proper parameters
+        def show_visualization(result, color):
+            visualizer = PuzzleSolutionVisualizer(
+                algorithm_name=result['name'],
+                algorithm_color=color,
+                nodes_explored=result['nodes'],
+                visited_nodes=result['visited'],
+                max_depth=result.get('max_depth'),
+                parent=self.root,  # Pass parent window
+                stats=result.get('stats')
+            )
+            visualizer.visualize(result['solution'])
+        
+        row_count = [0]
+        
+        def add_result(result):
+            if not comp_window.winfo_exists():
+                return
+            row_count[0] += 1
+            row = row_count[0]
+            color = result['color']
+            # A search stopped by the comparison time limit has no moves to show
+            moves_text = f"Stopped ({result['stopped']})" if result.get('stopped') else str(result['moves'])
+            
             # Algorithm name
             name_label = tk.Label(results_frame,
                                  text=result['name'],
                                  font=('Arial', 11, 'bold'),
                                  bg=self.bg_medium,
-                                 fg=colors[idx],
+                                 fg=color,
                                  width=col_widths[0]//7,
                                  padx=15,
                                  pady=15,
                                  anchor='w')
-            name_label.grid(row=idx+1, column=0, sticky='ew', padx=2, pady=2)
+            name_label.grid(row=row, column=0, sticky='ew', padx=2, pady=2)
             
             # Moves
             moves_label = tk.Label(results_frame,
-                                  text=str(result['moves']),
+                                  text=moves_text,
                                   font=('Arial', 11),
                                   bg=self.bg_medium,
                                   fg=self.fg_primary,
@@ -548,7 +730,7 @@ class PuzzleSolverGUI:
                                   padx=15,
                                   pady=15,
                                   anchor='center')
-            moves_label.grid(row=idx+1, column=1, sticky='ew', padx=2, pady=2)
+            moves_label.grid(row=row, column=1, sticky='ew', padx=2, pady=2)
             
             # Visited Nodes
             visited_label = tk.Label(results_frame,
@@ -560,11 +742,11 @@ class PuzzleSolverGUI:
                                     padx=15,
                                     pady=15,
                                     anchor='center')
-            visited_label.grid(row=idx+1, column=2, sticky='ew', padx=2, pady=2)
+            visited_label.grid(row=row, column=2, sticky='ew', padx=2, pady=2)
             
             # Number of Steps
             steps_label = tk.Label(results_frame,
-                                  text=str(result['moves']),
+                                  text=moves_text,
                                   font=('Arial', 11),
                                   bg=self.bg_medium,
                                   fg=self.fg_primary,
@@ -572,45 +754,15 @@ class PuzzleSolverGUI:
                                   padx=15,
                                   pady=15,
                                   anchor='center')
-            steps_label.grid(row=idx+1, column=3, sticky='ew', padx=2, pady=2)
-        
-        # Configure grid weights
-        for col in range(4):
-            results_frame.grid_columnconfigure(col, weight=1)
-        
-        # Visualization buttons
-        viz_frame = tk.Frame(comp_window, bg=self.bg_dark)
-        viz_frame.pack(pady=20)
-        
-        tk.Label(viz_frame,
-                text="View Visualization:",
-                font=('Arial', 11, 'bold'),
-                bg=self.bg_dark,
-                fg=self.fg_primary).pack(pady=(0, 10))
-        
-        button_container = tk.Frame(viz_frame, bg=self.bg_dark)
-        button_container.pack()
-        
-        # Create visualization function with proper parameters
-        def show_visualization(result, color):
-            max_depth = result['solver'].max_depth if hasattr(result['solver'], 'max_depth') else None
-            visited = getattr(result['solver'], 'visited_nodes', result['nodes'])
-            visualizer = PuzzleSolutionVisualizer(
-                algorithm_name=result['name'],
-                algorithm_color=color,
-                nodes_explored=result['nodes'],
-                visited_nodes=visited,
-                max_depth=max_depth,
-                parent=self.root  # Pass parent window
-            )
-            visualizer.visualize(result['solution'])
-        
-        for idx, result in enumerate(results):
+            steps_label.grid(row=row, column=3, sticky='ew', padx=2, pady=2)
+            
+            if result['solution'] is None:
+                return
             btn = tk.Button(button_container,
                           text=result['name'],
-                          command=lambda r=result, c=colors[idx]: show_visualization(r, c),
+                          command=lambda r=result, c=color: show_visualization(r, c),
                           font=('Arial', 10, 'bold'),
-                          bg=colors[idx],
+                          bg=color,
                           fg='white',
                           padx=20,
                           pady=10,
@@ -618,6 +770,9 @@ class PuzzleSolverGUI:
                           relief=tk.FLAT)
             btn.pack(side=tk.LEFT, padx=10)
         
+        for result in results:
+            add_result(result)
+        
         # Close button
         close_btn = tk.Button(comp_window,
                              text="Close",
@@ -630,7 +785,57 @@ class PuzzleSolverGUI:
                              cursor='hand2',
                              relief=tk.FLAT)
         close_btn.pack(pady=10)
-
+        
+        return add_result
+    
+    def show_profile_window(self, report, config):
+        """Show a profiling.ProfileReport in a new window."""
+        profile_window = tk.Toplevel(self.root)
+        profile_window.title(f"Profile - {config['name']}")
+        profile_window.geometry("900x700")
+        profile_window.configure(bg=self.bg_dark)
+        
+        title = tk.Label(profile_window,
+                        text=f"{config['name']} Profile ({report.mode})",
+                        font=('Arial', 18, 'bold'),
+                        bg=self.bg_dark,
+                        fg=config['color'])
+        title.pack(pady=20)
+        
+        # The report is a fixed-width table, so show it as monospaced text
+        text_frame = tk.Frame(profile_window, bg=self.bg_dark)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=40)
+        scrollbar = tk.Scrollbar(text_frame, orient=tk.VERTICAL)
+        report_text = tk.Text(text_frame,
+                              font=('Courier', 10),
+                              bg=self.bg_medium,
+                              fg=self.fg_primary,
+                              relief=tk.FLAT,
+                              wrap=tk.NONE,
+                              yscrollcommand=scrollbar.set)
+        scrollbar.config(command=report_text.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        report_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        report_text.insert(tk.END, format_report(report))
+        report_text.config(state='disabled')
+        
+        close_btn = tk.Button(profile_window,
+                             text="Close",
+                             command=profile_window.destroy,
+                             font=('Arial', 11),
+                             bg='#555555',
+                             fg='white',
+                             padx=30,
+                             pady=10,
+                             cursor='hand2',
+                             relief=tk.FLAT)
+        close_btn.pack(pady=10)
+    
+    def on_close(self):
+        """Stop background work before closing the main window."""
+        self.cancel_solve()
+        self.comparison_engine.shutdown(wait=False)
+        self.root.destroy()
 
 def main():
     root = tk.Tk()
@@ -7,7 +7,8 @@ class PuzzleSolutionVisualizer:
     Works with any solver that provides a solution path.
     """
     
-    def __init__(self, algorithm_name, algorithm_color, nodes_explored, visited_nodes=None, max_depth=None, parent=None):
+    def __init__(self, algorithm_name, algorithm_color, nodes_explored, visited_nodes=None, max_depth=None, parent=None,
+                 stats=None):
         """
         Initialize the visualizer.
         
@@ -18,6 +19,7 @@ class PuzzleSolutionVisualizer:
             visited_nodes: Number of unique nodes visited (stored in memory)
             max_depth: Optional max depth limit (for DFS)
             parent: Parent window (if None, creates new window)
+            stats: Optional SearchStats of the solve, shown under the metrics
         """
         self.algorithm_name = algorithm_name
         self.algorithm_color = algorithm_color
@@ -25,13 +27,14 @@ class PuzzleSolutionVisualizer:
         self.visited_nodes = visited_nodes if visited_nodes is not None else nodes_explored
         self.max_depth = max_depth
         self.parent = parent
+        self.stats = stats
     
     def visualize(self, solution):
         """
         Visualize the solution using a fullscreen Tkinter window with scrollable canvas.
         
         Args:
-            solution: List of PuzzleState objects representing the solution path
+            solution: SolutionPath (or list of PuzzleState objects) along the solution
         """
         if solution is None:
             print("No solution to visualize.")
@@ -114,9 +117,21 @@ class PuzzleSolutionVisualizer:
                               font=('Arial', 12), bg=bg_dark, fg=fg_secondary)
         nodes_label.grid(row=1, column=0, columnspan=boards_per_row, pady=(0, 15))
         
+        first_board_row = 2
+        if self.stats is not None:
+            stats = self.stats
+            stats_text = (f"Expanded: {stats.expanded:,} | Generated: {stats.generated:,} | "
+                          f"Duplicates: {stats.duplicates:,} | Max Frontier: {stats.max_frontier:,} | "
+                          f"Search Time: {stats.phase_times.get('search', 0.0):.3f}s")
+            stats_label = tk.Label(scrollable_frame,
+                                  text=stats_text,
+                                  font=('Arial', 10), bg=bg_dark, fg=fg_secondary)
+            stats_label.grid(row=2, column=0, columnspan=boards_per_row, pady=(0, 15))
+            first_board_row = 3
+        
         # Draw each board in grid layout
         for idx, state in enumerate(solution):
-            row_num = (idx // boards_per_row) + 2  # +2 for title and nodes row
+            row_num = (idx // boards_per_row) + first_board_row  # Below the title and metrics rows
             col_num = idx % boards_per_row
             
             # Create frame for this board
@@ -129,7 +144,7 @@ class PuzzleSolutionVisualizer:
         close_btn = tk.Button(scrollable_frame, text='Close Window', 
                             command=viz_window.destroy, font=('Arial', 12),
                             bg=self.algorithm_color, fg='white', padx=20, pady=10, relief=tk.FLAT)
-        close_btn.grid(row=(len(solution)//boards_per_row)+3, column=0, 
+        close_btn.grid(row=(len(solution)//boards_per_row)+first_board_row+1, column=0, 
                       columnspan=3, pady=30)
         
         # Don't call mainloop if we have a parent (it's already running)
@@ -162,21 +177,23 @@ class PuzzleSolutionVisualizer:
         step_label.pack(pady=(0, 10))
         
         # Canvas for the puzzle board
+        size = state.size
         board_canvas = tk.Canvas(parent_frame, 
-                                width=3*(cell_size+cell_padding)+10,
-                                height=3*(cell_size+cell_padding)+10,
+                                width=size*(cell_size+cell_padding)+10,
+                                height=size*(cell_size+cell_padding)+10,
                                 bg=bg_dark, highlightthickness=0)
         board_canvas.pack()
         
         # Get lighter version of algorithm color for tiles
         tile_color = self._get_lighter_color(self.algorithm_color)
         
-        # Draw the 3x3 puzzle
-        for i in range(3):
-            for j in range(3):
+        # Draw the puzzle
+        board = state.board
+        for i in range(size):
+            for j in range(size):
                 x = 5 + j * (cell_size + cell_padding)
                 y = 5 + i * (cell_size + cell_padding)
-                val = state.board[i][j]
+                val = board[i][j]
                 
                 if val == 0:
                     fill = bg_medium
@@ -211,8 +228,8 @@ class PuzzleSolutionVisualizer:
         cost_frame = tk.Frame(parent_frame, bg=bg_dark)
         cost_frame.pack(pady=(10, 0))
         
-        if self.algorithm_name == "A* Search":
-            # A* shows g, h, and f
+        if self.algorithm_name in ("A* Search", "IDA* Search", "Bidirectional A*"):
+            # A*, IDA* and bidirectional A* show g, h, and f
             g_label = tk.Label(cost_frame, text=f"g = {state.g}", 
                              font=('Arial', 11), bg=bg_dark, fg='#ff6b6b')
             g_label.pack()
@@ -224,8 +241,8 @@ class PuzzleSolutionVisualizer:
             f_label = tk.Label(cost_frame, text=f"f = {state.total_cost}", 
                              font=('Arial', 11, 'bold'), bg=bg_dark, fg=self.algorithm_color)
             f_label.pack()
-        elif self.algorithm_name == "Greedy Best-First":
-            # GBFS shows f(n) = h only
+        elif self.algorithm_name in ("Greedy Best-First", "Beam Search"):
+            # GBFS and beam search rank by h only
             f_label = tk.Label(cost_frame, text=f"f(n) = {state.h}", 
                              font=('Arial', 11, 'bold'), bg=bg_dark, fg=self.algorithm_color)
             f_label.pack()
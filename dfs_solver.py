@@ -1,63 +1,97 @@
-from puzzle_state import PuzzleState
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, stop_search, run_search
+from successors import expand
+from solution_path import SolutionPath
+from permutation_rank import new_visited_set
 
 
 class DFSSolver:
-    def __init__(self):
-        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    def __init__(self, size=3):
+        self.size = size
+        self.goal_state = goal_board(size)
         self.nodes_explored = 0
         self.visited_nodes = 0
         self.max_depth = 50
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
     
     def get_possible_moves(self, state):
-        neighbors = []
-        blank_row, blank_col = state.find_blank_position()
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-        
-        for dr, dc, move_name in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in state.board]
-                new_board[blank_row][blank_col], new_board[new_row][new_col] = new_board[new_row][new_col], new_board[blank_row][blank_col]
-                new_state = PuzzleState(board=new_board, g=state.g + 1, h=0, parent=state, move=move_name)
-                neighbors.append(new_state)
-        return neighbors
+        return expand(state)
+    
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+    
+    def solve(self, initial_board, limits=None):
+        """Path to the goal within max_depth moves, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
     
-    def solve(self, initial_board):
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+    
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+        
+        stats = budget.stats
         initial_state = PuzzleState(board=initial_board, g=0, h=0)
         goal = PuzzleState(board=self.goal_state)
         stack = [initial_state]
-        visited = set()
-        visited.add(hash(initial_state))
+        visited = new_visited_set(self.size)
+        visited.add(initial_state.packed)
         self.nodes_explored = 0
+        stats.phase("search")
         
         while stack:
+            if len(stack) > stats.max_frontier:
+                stats.max_frontier = len(stack)
             current = stack.pop()
+            if self.nodes_explored >= budget.next_check:
+                reason = budget.check(self.cancel_requested, self.nodes_explored, len(visited) + len(stack))
+                if reason is not None:
+                    self.visited_nodes = len(visited)
+                    return stop_search(self, reason, budget, None, len(stack) + 1, current.g)
+                yield budget.progress(self.nodes_explored, len(stack) + 1, current.g)
             self.nodes_explored += 1
             
+            if current.g > stats.max_depth:
+                stats.max_depth = current.g
+            
             if current == goal:
                 self.visited_nodes = len(visited)
-                print(f"DFS Solution found! Nodes explored: {self.nodes_explored}, Visited: {self.visited_nodes}")
+                stats.phase("path")
                 return self.build_solution_path(current)
             
             if current.g >= self.max_depth:
                 continue
             
-            for neighbor in reversed(self.get_possible_moves(current)):
-                neighbor_hash = hash(neighbor)
-                if neighbor_hash not in visited:
-                    visited.add(neighbor_hash)
+            neighbors = self.get_possible_moves(current)
+            stats.generated += len(neighbors)
+            for neighbor in reversed(neighbors):
+                if visited.visit(neighbor.packed):
                     stack.append(neighbor)
+                else:
+                    stats.duplicates += 1
         
-        print(f"DFS: No solution found after exploring {self.nodes_explored} nodes.")
+        self.visited_nodes = len(visited)
         return None
     
     def build_solution_path(self, state):
-        path = []
-        current = state
-        while current is not None:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
+        return SolutionPath.from_state(state)
     
     def display_solution(self, solution):
         if solution is None:
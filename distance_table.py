@@ -0,0 +1,80 @@
+"""
+Precomputed optimal distances for every 3x3 board.
+
+One retrograde BFS from the goal visits all 181,440 reachable boards and
+stores, at each board's permutation rank, a single byte:
+
+    (distance << 2) | best move code
+
+where the best move (a successors.MOVE_CODES value) is the blank move
+that steps one move closer to the goal. Boards outside the goal's
+component keep the UNREACHABLE byte. The table is written to disk once
+and memory-mapped by TableSolver.
+
+Usage:
+    python distance_table.py [output_path]
+"""
+
+import mmap
+import os
+import sys
+from collections import deque
+
+from puzzle_state import CELL_BITS, CELL_MASK, pack_board
+from permutation_rank import STATE_COUNT, rank
+from successors import MOVE_TABLE, MOVE_CODES
+
+UNREACHABLE = 0xFF
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "distance_table.bin")
+GOAL_BOARD = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+
+
+def build_distance_table():
+    """Run the retrograde BFS and return the table as a bytearray."""
+    table = bytearray([UNREACHABLE]) * STATE_COUNT
+    goal = pack_board(GOAL_BOARD)
+    goal_blank = len(MOVE_TABLE) - 1
+    table[rank(goal)] = 0
+    queue = deque([(goal, goal_blank, 0)])
+
+    while queue:
+        packed, blank, distance = queue.popleft()
+        blank_shift = blank * CELL_BITS
+        child_distance = distance + 1
+
+        for target, target_shift, move_name in MOVE_TABLE[blank]:
+            tile = (packed >> target_shift) & CELL_MASK
+            child = packed ^ (tile << target_shift) | (tile << blank_shift)
+            child_rank = rank(child)
+            if table[child_rank] == UNREACHABLE:
+                # Undoing this move from the child leads back towards the goal
+                table[child_rank] = (child_distance << 2) | (MOVE_CODES[move_name] ^ 1)
+                queue.append((child, target, child_distance))
+
+    return table
+
+
+def write_distance_table(path=DEFAULT_TABLE_PATH):
+    """Build the table and write it to `path`."""
+    table = build_distance_table()
+    with open(path, "wb") as table_file:
+        table_file.write(table)
+    return path
+
+
+def load_distance_table(path=DEFAULT_TABLE_PATH):
+    """Memory-map a table file read-only, building it first if it is missing."""
+    if not os.path.exists(path):
+        write_distance_table(path)
+    with open(path, "rb") as table_file:
+        table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != STATE_COUNT:
+        table.close()
+        raise ValueError(f"{path} is not a distance table ({len(table)} bytes, expected {STATE_COUNT})")
+    return table
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLE_PATH
+    write_distance_table(output_path)
+    print(f"Distance table written to {output_path}")
@@ -1,41 +1,68 @@
 import heapq
-from puzzle_state import PuzzleState
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, stop_search, run_search
+from successors import expand
+from solution_path import SolutionPath
+from permutation_rank import new_visited_set
+from heuristics import manhattan_tables, manhattan_distance
 
 
 class GreedySolver:
-    def __init__(self):
-        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    def __init__(self, size=3, heuristic=None):
+        if heuristic is not None and heuristic.size != size:
+            raise ValueError(f"Heuristic is for {heuristic.size}x{heuristic.size} boards, solver for {size}x{size}")
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.h_delta = manhattan_tables(size).delta
+        self.heuristic = heuristic  # e.g. a PatternDatabase; Manhattan distance when None
         self.nodes_explored = 0
         self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
     
     def calculate_manhattan_distance(self, board):
-        distance = 0
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] != 0:
-                    target_value = board[i][j]
-                    target_row = (target_value - 1) // 3
-                    target_col = (target_value - 1) % 3
-                    distance += abs(i - target_row) + abs(j - target_col)
-        return distance
+        return manhattan_distance(board)
+    
+    def calculate_heuristic(self, board):
+        if self.heuristic is not None:
+            return self.heuristic.distance(board)
+        return self.calculate_manhattan_distance(board)
     
     def get_possible_moves(self, state):
-        neighbors = []
-        blank_row, blank_col = state.find_blank_position()
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-        
-        for dr, dc, move_name in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in state.board]
-                new_board[blank_row][blank_col], new_board[new_row][new_col] = new_board[new_row][new_col], new_board[blank_row][blank_col]
-                h = self.calculate_manhattan_distance(new_board)
-                new_state = PuzzleState(board=new_board, g=state.g + 1, h=h, parent=state, move=move_name)
-                neighbors.append(new_state)
-        return neighbors
+        return expand(state, self.h_delta, self.heuristic)
+    
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
     
-    def solve(self, initial_board):
-        h_initial = self.calculate_manhattan_distance(initial_board)
+    def solve(self, initial_board, limits=None):
+        """Path to the goal, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
+    
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        yield budget.finished(self, solution)
+    
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+        
+        stats = budget.stats
+        h_initial = self.calculate_heuristic(initial_board)
+        stats.heuristic_evaluations = 1
         initial_state = PuzzleState(board=initial_board, g=0, h=h_initial)
         goal = PuzzleState(board=self.goal_state)
         
@@ -45,38 +72,50 @@ class GreedySolver:
         heapq.heappush(open_list, (initial_state.h, counter, initial_state))
         counter += 1
         
-        visited = set()
-        visited.add(hash(initial_state))
+        visited = new_visited_set(self.size)
+        visited.add(initial_state.packed)
         self.nodes_explored = 0
         self.visited_nodes = 0
+        best_state = initial_state  # Expanded board closest to the goal, for partial results
+        stats.phase("search")
         
         while open_list:
+            if len(open_list) > stats.max_frontier:
+                stats.max_frontier = len(open_list)
             _, _, current = heapq.heappop(open_list)
+            if self.nodes_explored >= budget.next_check:
+                reason = budget.check(self.cancel_requested, self.nodes_explored, len(visited) + len(open_list))
+                if reason is not None:
+                    self.visited_nodes = len(visited)
+                    return stop_search(self, reason, budget, self.build_solution_path(best_state),
+                                       len(open_list) + 1, current.h)
+                yield budget.progress(self.nodes_explored, len(open_list) + 1, current.h)
             self.nodes_explored += 1
+            if current.h < best_state.h:
+                best_state = current
+            if current.g > stats.max_depth:
+                stats.max_depth = current.g
             
             if current == goal:
                 self.visited_nodes = len(visited)
-                print(f"Greedy Solution found! Nodes explored: {self.nodes_explored}, Visited: {self.visited_nodes}")
+                stats.phase("path")
                 return self.build_solution_path(current)
             
-            for neighbor in self.get_possible_moves(current):
-                neighbor_hash = hash(neighbor)
-                if neighbor_hash not in visited:
-                    visited.add(neighbor_hash)
+            neighbors = self.get_possible_moves(current)
+            stats.generated += len(neighbors)
+            stats.heuristic_evaluations += len(neighbors)
+            for neighbor in neighbors:
+                if visited.visit(neighbor.packed):
                     heapq.heappush(open_list, (neighbor.h, counter, neighbor))
                     counter += 1
+                else:
+                    stats.duplicates += 1
         
         self.visited_nodes = len(visited)
-        print(f"Greedy: No solution found after exploring {self.nodes_explored} nodes.")
         return None
     
     def build_solution_path(self, state):
-        path = []
-        current = state
-        while current is not None:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
+        return SolutionPath.from_state(state, self.h_delta, self.heuristic)
     
     def display_solution(self, solution):
         if solution is None:
@@ -0,0 +1,81 @@
+"""
+Manhattan-distance heuristic with precomputed tables.
+
+For a given board size, table[tile][index] is the distance of `tile` at
+flat cell `index` from its goal cell, and delta[tile][source][dest] is
+the change in total distance when `tile` slides from `source` to `dest`,
+which lets a child's h be derived from its parent's h in O(1).
+manhattan_tables_to() builds the same tables towards any other board,
+for searches that run backwards from the goal.
+"""
+
+from collections import namedtuple
+
+from puzzle_state import BOARD_SIZE
+
+ManhattanTables = namedtuple("ManhattanTables", ["table", "delta"])
+
+
+def _build_manhattan_table(size, target_cells=None):
+    cell_count = size * size
+    table = [[0] * cell_count]  # The blank does not count
+    for tile in range(1, cell_count):
+        target = tile - 1 if target_cells is None else target_cells[tile]
+        goal_row, goal_col = divmod(target, size)
+        distances = []
+        for index in range(cell_count):
+            row, col = divmod(index, size)
+            distances.append(abs(row - goal_row) + abs(col - goal_col))
+        table.append(distances)
+    return tuple(tuple(distances) for distances in table)
+
+
+def _build_manhattan_delta(table):
+    cell_count = len(table)
+    return tuple(
+        tuple(
+            tuple(distances[dest] - distances[source] for dest in range(cell_count))
+            for source in range(cell_count)
+        )
+        for distances in table
+    )
+
+
+_MANHATTAN_TABLES = {}
+
+
+def manhattan_tables(size=BOARD_SIZE):
+    """Distance and delta tables for a size x size board, built on first use."""
+    tables = _MANHATTAN_TABLES.get(size)
+    if tables is None:
+        table = _build_manhattan_table(size)
+        tables = ManhattanTables(table, _build_manhattan_delta(table))
+        _MANHATTAN_TABLES[size] = tables
+    return tables
+
+
+MANHATTAN_TABLE, MANHATTAN_DELTA = manhattan_tables(BOARD_SIZE)
+
+
+def manhattan_tables_to(board):
+    """Distance and delta tables towards an arbitrary board instead of the goal."""
+    target_cells = [0] * (len(board) * len(board))
+    index = 0
+    for row in board:
+        for value in row:
+            target_cells[value] = index
+            index += 1
+    table = _build_manhattan_table(len(board), target_cells)
+    return ManhattanTables(table, _build_manhattan_delta(table))
+
+
+def manhattan_distance(board):
+    """Full Manhattan distance of a list-of-lists board of any size."""
+    table = manhattan_tables(len(board)).table
+    distance = 0
+    index = 0
+    for row in board:
+        for value in row:
+            distance += table[value][index]
+            index += 1
+    return distance
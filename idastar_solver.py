@@ -0,0 +1,211 @@
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, SearchStopped, stop_search, run_search
+from successors import move_tables
+from solution_path import SolutionPath
+from heuristics import manhattan_tables, manhattan_distance
+
+
+class IDAStarSolver:
+    """
+    Iterative Deepening A*: repeated depth-first searches bounded by
+    f = g + h, raising the bound to the smallest f that exceeded it.
+    The board is mutated in place and only the current path is stored,
+    so memory is linear in the solution depth.
+    """
+
+    def __init__(self, size=3, heuristic=None):
+        if heuristic is not None and heuristic.size != size:
+            raise ValueError(f"Heuristic is for {heuristic.size}x{heuristic.size} boards, solver for {size}x{size}")
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.h_delta = manhattan_tables(size).delta
+        self.heuristic = heuristic  # e.g. a PatternDatabase; Manhattan distance when None
+        self.move_tables = move_tables(size)
+        self.nodes_explored = 0
+        self.visited_nodes = 0
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
+
+    def calculate_manhattan_distance(self, board):
+        return manhattan_distance(board)
+
+    def calculate_heuristic(self, board):
+        if self.heuristic is not None:
+            return self.heuristic.distance(board)
+        return self.calculate_manhattan_distance(board)
+
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+
+    def solve(self, initial_board, limits=None):
+        """Shortest path to the goal, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
+
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        # Only the current path is stored
+        yield budget.finished(self, solution, stored_nodes=budget.stats.max_frontier)
+
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+
+        stats = budget.stats
+        initial_state = PuzzleState(board=initial_board, g=0, h=self.calculate_heuristic(initial_board))
+        stats.heuristic_evaluations = 1
+        tiles = [value for row in initial_board for value in row]
+        self.nodes_explored = 0
+        self.visited_nodes = 0
+        stats.phase("search")
+
+        bound = initial_state.h
+        while True:
+            iteration_start = self.nodes_explored
+            try:
+                moves, next_bound = yield from self._bounded_search(tiles, initial_state.blank, initial_state.h, bound, budget)
+            except SearchStopped as stopped:
+                self.visited_nodes = self.nodes_explored - iteration_start
+                return stop_search(self, stopped.reason, budget, f_bound=bound)
+            self.visited_nodes = self.nodes_explored - iteration_start
+
+            if moves is not None:
+                stats.phase("path")
+                return self.build_solution_path(initial_state, moves)
+            if next_bound is None:
+                return None
+            bound = next_bound
+
+    def _bounded_search(self, tiles, blank, h, bound, budget):
+        """
+        Depth-first search with f <= bound on an explicit stack.
+
+        Returns (moves, None) when the goal is reached, otherwise
+        (None, smallest f that exceeded the bound). `tiles` is restored
+        to its original order before returning without a solution.
+        Yields progress snapshots on the way.
+        """
+        if self.nodes_explored >= budget.next_check:
+            reason = budget.check(self.cancel_requested, self.nodes_explored, 1)
+            if reason is not None:
+                raise SearchStopped(reason)
+            yield budget.progress(self.nodes_explored, None, bound)
+        self.nodes_explored += 1
+        if h == 0:
+            return [], None
+
+        g = 0
+        next_bound = None
+        path = []  # (blank before the move, h before the move, move name)
+        pruned = self.move_tables.pruned
+        h_delta = self.h_delta
+        heuristic = self.heuristic
+        stats = budget.stats
+        # tile -> cell, kept in step with `tiles` for the pattern database lookups
+        cells = None
+        if heuristic is not None:
+            cells = [0] * len(tiles)
+            for cell, value in enumerate(tiles):
+                cells[value] = cell
+        candidates = [pruned[blank][""]]
+        positions = [0]
+        # Every candidate move gets its child's h computed before the bound test
+        stats.generated += len(candidates[0])
+        stats.heuristic_evaluations += len(candidates[0])
+
+        while positions:
+            index = positions[-1]
+            moves = candidates[-1]
+
+            if index == len(moves):
+                # Every child tried: undo the move that led here
+                candidates.pop()
+                positions.pop()
+                if path:
+                    previous_blank, h, _ = path.pop()
+                    tiles[blank] = tiles[previous_blank]
+                    tiles[previous_blank] = 0
+                    if cells is not None:
+                        cells[tiles[blank]] = blank
+                    blank = previous_blank
+                    g -= 1
+                continue
+
+            positions[-1] = index + 1
+            target, _, move_name = moves[index]
+            tile = tiles[target]
+            if cells is not None:
+                child_h = h + heuristic.move_delta(cells, tile, blank)
+            else:
+                child_h = h + h_delta[tile][target][blank]
+            f = g + 1 + child_h
+            if f > bound:
+                if next_bound is None or f < next_bound:
+                    next_bound = f
+                continue
+
+            tiles[blank] = tile
+            tiles[target] = 0
+            if cells is not None:
+                cells[tile] = blank
+            path.append((blank, h, move_name))
+            blank = target
+            h = child_h
+            g += 1
+            if g > stats.max_depth:
+                stats.max_depth = stats.max_frontier = g
+            if self.nodes_explored >= budget.next_check:
+                reason = budget.check(self.cancel_requested, self.nodes_explored, len(path))
+                if reason is not None:
+                    raise SearchStopped(reason)
+                yield budget.progress(self.nodes_explored, None, bound)
+            self.nodes_explored += 1
+
+            if h == 0:
+                solution_moves = [move for _, _, move in path]
+                # Put the board back so the caller's tiles are unchanged
+                while path:
+                    previous_blank, _, _ = path.pop()
+                    tiles[blank] = tiles[previous_blank]
+                    tiles[previous_blank] = 0
+                    blank = previous_blank
+                return solution_moves, None
+
+            moves = pruned[blank][move_name]
+            stats.generated += len(moves)
+            stats.heuristic_evaluations += len(moves)
+            candidates.append(moves)
+            positions.append(0)
+
+        return None, next_bound
+
+    def build_solution_path(self, initial_state, moves):
+        """Solution along a list of move names; states are built when the path is read."""
+        return SolutionPath.from_names(initial_state, moves, self.h_delta, self.heuristic)
+    
+    def display_solution(self, solution):
+        if solution is None:
+            print("No solution to print.")
+            return
+        
+        print(f"\nIDA* Solution found in {len(solution) - 1} moves:\n")
+        for i, state in enumerate(solution):
+            if state.move:
+                print(f"Move {i}: {state.move}")
+            else:
+                print(f"Initial State:")
+            state.display_board()
+            print()
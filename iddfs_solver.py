@@ -1,74 +1,161 @@
-from puzzle_state import PuzzleState
+from puzzle_state import PuzzleState, goal_board
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, SearchStopped, stop_search, run_search
+from successors import expand, move_tables, MOVE_CODES
+from solution_path import SolutionPath
 
 
 class IDDFSSolver:
-    def __init__(self):
-        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    def __init__(self, size=3):
+        self.size = size
+        self.goal_state = goal_board(size)
+        self.move_tables = move_tables(size)
         self.nodes_explored = 0
-        self.visited_nodes = 0
+        self.visited_nodes = 0  # Nodes expanded by the last iteration
+        self.nodes_per_iteration = []  # Nodes expanded by each depth iteration of the last solve
         self.max_depth = 50
+        self.solvability = None
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None  # Set when a limit stops the search, see search_control
+        self.stats = None  # SearchStats of the last solve, see search_control
     
     def get_possible_moves(self, state):
-        neighbors = []
-        blank_row, blank_col = state.find_blank_position()
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-        
-        for dr, dc, move_name in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in state.board]
-                new_board[blank_row][blank_col], new_board[new_row][new_col] = new_board[new_row][new_col], new_board[blank_row][blank_col]
-                new_state = PuzzleState(board=new_board, g=state.g + 1, h=0, parent=state, move=move_name)
-                neighbors.append(new_state)
-        return neighbors
+        return expand(state)
+    
+    def cancel(self):
+        """Ask a running solve() to stop at its next check."""
+        self.cancel_requested = True
+    
+    def solve(self, initial_board, limits=None):
+        """Shortest path to the goal within max_depth moves, or None. `limits` is an optional search_control.SearchLimits."""
+        return run_search(self.solve_iter(initial_board, limits))
+    
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator of SearchProgress snapshots every `interval` expansions, ending with the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = yield from self._search(initial_board, budget)
+        # Only the current path is stored
+        yield budget.finished(self, solution, stored_nodes=budget.stats.max_frontier)
     
-    def solve(self, initial_board):
+    def _search(self, initial_board, budget):
+        self.cancel_requested = False
+        self.cancelled = False
+        self.partial_result = None
+        self.solvability = check_solvability(initial_board, self.size)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+        
         initial_state = PuzzleState(board=initial_board, g=0, h=0)
-        goal = PuzzleState(board=self.goal_state)
+        goal_packed = PuzzleState(board=self.goal_state).packed
         
         self.nodes_explored = 0
         self.visited_nodes = 0
+        self.nodes_per_iteration = []
+        budget.stats.phase("search")
         
         # Iteratively increase depth limit
         for depth in range(self.max_depth):
-            visited_at_depth = set()
-            result = self._depth_limited_search(initial_state, goal, depth, visited_at_depth)
-            self.visited_nodes += len(visited_at_depth)
+            iteration_start = self.nodes_explored
+            try:
+                moves = yield from self._depth_limited_search(initial_state.packed, initial_state.blank,
+                                                              goal_packed, depth, budget)
+            except SearchStopped as stopped:
+                self.visited_nodes = self.nodes_explored - iteration_start
+                self.nodes_per_iteration.append(self.visited_nodes)
+                return stop_search(self, stopped.reason, budget, f_bound=depth)
+            self.visited_nodes = self.nodes_explored - iteration_start
+            self.nodes_per_iteration.append(self.visited_nodes)
             
-            if result is not None:
-                print(f"IDDFS Solution found at depth {depth}! Nodes explored: {self.nodes_explored}, Visited: {self.visited_nodes}")
-                return result
+            if moves is not None:
+                budget.stats.phase("path")
+                return self.build_solution_path(initial_state, moves)
         
-        print(f"IDDFS: No solution found within depth limit {self.max_depth}. Nodes explored: {self.nodes_explored}")
         return None
     
-    def _depth_limited_search(self, current, goal, depth_limit, visited):
-        """Perform depth-limited DFS."""
-        self.nodes_explored += 1
-        visited.add(hash(current))
-        
-        if current == goal:
-            return self.build_solution_path(current)
+    def _depth_limited_search(self, packed, blank, goal_packed, depth_limit, budget):
+        """
+        Depth-limited DFS on an explicit stack, yielding progress snapshots
+        on the way. Returns the move codes to the goal, or None.
         
+        Only boards on the current path are excluded, so a board reached
+        again by a shorter route is still searched below it.
+        """
+        if self.nodes_explored >= budget.next_check:
+            reason = budget.check(self.cancel_requested, self.nodes_explored, 1)
+            if reason is not None:
+                raise SearchStopped(reason)
+            yield budget.progress(self.nodes_explored, None, depth_limit)
+        self.nodes_explored += 1
+        if packed == goal_packed:
+            return []
         if depth_limit == 0:
             return None
         
-        for neighbor in self.get_possible_moves(current):
-            neighbor_hash = hash(neighbor)
-            if neighbor_hash not in visited:
-                result = self._depth_limited_search(neighbor, goal, depth_limit - 1, visited)
-                if result is not None:
-                    return result
+        tables = self.move_tables
+        pruned = tables.pruned
+        cell_mask = tables.cell_mask
+        cell_bits = tables.cell_bits
+        stats = budget.stats
+        path = []  # (packed, blank, move code) of every board above the current one
+        on_path = {packed}
+        candidates = [pruned[blank][""]]
+        positions = [0]
+        stats.generated += len(candidates[0])
+        
+        while positions:
+            index = positions[-1]
+            moves = candidates[-1]
+            
+            if index == len(moves):
+                # Every child tried: step back to the parent
+                candidates.pop()
+                positions.pop()
+                if path:
+                    on_path.discard(packed)
+                    packed, blank, _ = path.pop()
+                continue
+            
+            positions[-1] = index + 1
+            target, target_shift, move_name = moves[index]
+            tile = (packed >> target_shift) & cell_mask
+            child = packed ^ (tile << target_shift) | (tile << (blank * cell_bits))
+            if child in on_path:
+                stats.duplicates += 1
+                continue
+            
+            path.append((packed, blank, MOVE_CODES[move_name]))
+            packed = child
+            blank = target
+            on_path.add(child)
+            if len(path) > stats.max_depth:
+                stats.max_depth = stats.max_frontier = len(path)
+            if self.nodes_explored >= budget.next_check:
+                reason = budget.check(self.cancel_requested, self.nodes_explored, len(path))
+                if reason is not None:
+                    raise SearchStopped(reason)
+                yield budget.progress(self.nodes_explored, None, depth_limit)
+            self.nodes_explored += 1
+            
+            if packed == goal_packed:
+                return [code for _, _, code in path]
+            
+            if len(path) < depth_limit:
+                moves = pruned[blank][move_name]
+                stats.generated += len(moves)
+                candidates.append(moves)
+                positions.append(0)
+            else:
+                on_path.discard(packed)
+                packed, blank, _ = path.pop()
         
         return None
     
-    def build_solution_path(self, state):
-        path = []
-        current = state
-        while current is not None:
-            path.append(current)
-            current = current.parent
-        return path[::-1]
+    def build_solution_path(self, initial_state, moves):
+        return SolutionPath(initial_state, moves)
     
     def display_solution(self, solution):
         if solution is None:
@@ -1,18 +1,29 @@
 """
 8-Puzzle Solver - Main Entry Point
 Follows Single Responsibility Principle: Only handles program startup
+
+With no arguments this opens the GUI. Any arguments are handed to the
+headless command line in puzzle.py, e.g. `python main.py solve < boards.jsonl`.
 """
 
-from design.gui_interface import PuzzleSolverGUI
-import tkinter as tk
+import sys
 
 
 def main():
     """Main entry point for the 8-Puzzle solver application."""
+    if len(sys.argv) > 1:
+        import puzzle
+        puzzle.main()
+        return
+
+    # Imported here so headless machines never need tkinter
+    import tkinter as tk
+    from design.gui_interface import PuzzleSolverGUI
+
     root = tk.Tk()
     app = PuzzleSolverGUI(root)
     root.mainloop()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
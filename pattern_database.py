@@ -0,0 +1,216 @@
+"""
+Additive disjoint pattern databases.
+
+A pattern is a group of tiles. Its database stores, for every placement
+of those tiles, the fewest moves of pattern tiles needed to bring them
+home, with every other tile treated as indistinguishable. Moves of other
+tiles are free, so the databases of disjoint patterns can be summed and
+the total is still an admissible heuristic, and it dominates Manhattan
+distance.
+
+Each database is built once by a 0-1 BFS backwards from the goal over
+(pattern placement, blank cell) pairs and stored as one byte per
+placement, indexed by the placement's partial-permutation rank. Files are
+written to DEFAULT_DATABASE_DIR and memory-mapped on load.
+
+The default 4x4 partition is 5-5-5; a 6-6-3 partition can be passed
+explicitly but takes much longer to build.
+
+Usage:
+    python pattern_database.py [size] [output_dir]
+"""
+
+import mmap
+import os
+import sys
+from collections import deque
+from math import factorial
+
+from puzzle_state import BOARD_SIZE, cell_bits
+from successors import move_tables
+
+UNREACHABLE = 0xFF
+DEFAULT_DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_databases")
+
+DEFAULT_PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 5, 6, 9), (3, 4, 7, 8, 12), (10, 11, 13, 14, 15)),
+}
+
+
+def placement_count(cell_count, tile_count):
+    """Number of ways to place `tile_count` distinct tiles on `cell_count` cells."""
+    return factorial(cell_count) // factorial(cell_count - tile_count)
+
+
+def _rank_weights(cell_count, tile_count):
+    # Weight of the i-th digit, i.e. (cell_count - 1 - i)! / (cell_count - tile_count)!
+    return tuple(placement_count(cell_count - 1 - i, tile_count - 1 - i) for i in range(tile_count))
+
+
+def rank_placement(cells, weights):
+    """Partial-permutation rank of the cells occupied by a pattern's tiles, in pattern order."""
+    result = 0
+    for i, cell in enumerate(cells):
+        digit = cell
+        for earlier in cells[:i]:
+            if earlier < cell:
+                digit -= 1
+        result += digit * weights[i]
+    return result
+
+
+def build_pattern_database(size, pattern):
+    """Run the backward 0-1 BFS for one pattern and return its table as a bytearray."""
+    cell_count = size * size
+    tile_count = len(pattern)
+    weights = _rank_weights(cell_count, tile_count)
+    moves = move_tables(size).moves
+    # Queue entries pack the pattern cells and then the blank, `bits` bits each
+    bits = cell_bits(size)
+    mask = (1 << bits) - 1
+    blank_shift = bits * tile_count
+
+    goal_cells = [tile - 1 for tile in pattern]
+    goal_blank = cell_count - 1
+    # Distance of every (placement, blank) pair; 0-1 BFS needs per-pair distances
+    distances = bytearray([UNREACHABLE]) * (placement_count(cell_count, tile_count) * cell_count)
+    distances[rank_placement(goal_cells, weights) * cell_count + goal_blank] = 0
+    start = sum(cell << (bits * i) for i, cell in enumerate(goal_cells)) | (goal_blank << blank_shift)
+    queue = deque([(start, 0)])
+
+    while queue:
+        entry, distance = queue.popleft()
+        cells = [(entry >> (bits * i)) & mask for i in range(tile_count)]
+        blank = entry >> blank_shift
+        placement = rank_placement(cells, weights)
+        if distances[placement * cell_count + blank] < distance:
+            continue
+        placement_entry = entry & ((1 << blank_shift) - 1)
+
+        for target, _, _ in moves[blank]:
+            if target in cells:
+                # A pattern tile slides into the blank: costs one move
+                slot = cells.index(target)
+                cells[slot] = blank
+                child_distance = distance + 1
+                child_index = rank_placement(cells, weights) * cell_count + target
+                if distances[child_index] > child_distance:
+                    distances[child_index] = child_distance
+                    child_entry = placement_entry ^ ((target ^ blank) << (bits * slot))
+                    queue.append((child_entry | (target << blank_shift), child_distance))
+                cells[slot] = target
+            else:
+                # Any other tile moves for free
+                child_index = placement * cell_count + target
+                if distances[child_index] > distance:
+                    distances[child_index] = distance
+                    queue.appendleft((placement_entry | (target << blank_shift), distance))
+
+    table = bytearray([UNREACHABLE]) * placement_count(cell_count, tile_count)
+    for placement in range(len(table)):
+        start = placement * cell_count
+        table[placement] = min(distances[start:start + cell_count])
+    return table
+
+
+def database_path(size, pattern, directory=DEFAULT_DATABASE_DIR):
+    """File holding the database of `pattern` on a size x size board."""
+    return os.path.join(directory, f"{size}x{size}_{'-'.join(map(str, pattern))}.bin")
+
+
+def write_pattern_database(size, pattern, directory=DEFAULT_DATABASE_DIR):
+    """Build one pattern's table and write it under `directory`."""
+    path = database_path(size, pattern, directory)
+    os.makedirs(directory, exist_ok=True)
+    table = build_pattern_database(size, pattern)
+    with open(path, "wb") as table_file:
+        table_file.write(table)
+    return path
+
+
+def _load_table(size, pattern, directory):
+    path = database_path(size, pattern, directory)
+    if not os.path.exists(path):
+        write_pattern_database(size, pattern, directory)
+    expected = placement_count(size * size, len(pattern))
+    with open(path, "rb") as table_file:
+        table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != expected:
+        table.close()
+        raise ValueError(f"{path} is not a pattern database ({len(table)} bytes, expected {expected})")
+    return table
+
+
+class PatternDatabase:
+    """Additive heuristic summing the memory-mapped databases of disjoint patterns."""
+
+    def __init__(self, size=BOARD_SIZE, partition=None, directory=DEFAULT_DATABASE_DIR):
+        if partition is None:
+            if size not in DEFAULT_PARTITIONS:
+                raise ValueError(f"No default partition for {size}x{size} boards; pass one explicitly")
+            partition = DEFAULT_PARTITIONS[size]
+        cell_count = size * size
+        tiles = [tile for pattern in partition for tile in pattern]
+        if sorted(tiles) != list(range(1, cell_count)):
+            # Full coverage keeps h == 0 exactly at the goal
+            raise ValueError(f"Partition must split tiles 1..{cell_count - 1} into disjoint patterns, got {partition}")
+
+        self.size = size
+        self.partition = tuple(tuple(pattern) for pattern in partition)
+        self.cell_bits = cell_bits(size)
+        self.weights = tuple(_rank_weights(cell_count, len(pattern)) for pattern in self.partition)
+        self.tables = tuple(_load_table(size, pattern, directory) for pattern in self.partition)
+        # tile -> index of its pattern (the blank has none)
+        self.tile_pattern = [None] * cell_count
+        for pattern_index, pattern in enumerate(self.partition):
+            for tile in pattern:
+                self.tile_pattern[tile] = pattern_index
+
+    def cells_of(self, packed):
+        """List mapping each tile to its flat cell on a packed board."""
+        bits = self.cell_bits
+        mask = (1 << bits) - 1
+        cells = [0] * (self.size * self.size)
+        for index in range(len(cells)):
+            cells[(packed >> (bits * index)) & mask] = index
+        return cells
+
+    def _lookup(self, pattern_index, cells):
+        pattern_cells = [cells[tile] for tile in self.partition[pattern_index]]
+        return self.tables[pattern_index][rank_placement(pattern_cells, self.weights[pattern_index])]
+
+    def distance(self, board):
+        """Heuristic value of a list-of-lists board."""
+        cells = [0] * (self.size * self.size)
+        index = 0
+        for row in board:
+            for value in row:
+                cells[value] = index
+                index += 1
+        return sum(self._lookup(pattern_index, cells) for pattern_index in range(len(self.partition)))
+
+    def move_delta(self, cells, tile, dest):
+        """
+        Change in heuristic value when `tile` slides from cells[tile] to
+        `dest`. Only the tile's own pattern is looked up; `cells` is left
+        unchanged.
+        """
+        pattern_index = self.tile_pattern[tile]
+        before = self._lookup(pattern_index, cells)
+        source = cells[tile]
+        cells[tile] = dest
+        after = self._lookup(pattern_index, cells)
+        cells[tile] = source
+        return after - before
+
+    def close(self):
+        for table in self.tables:
+            table.close()
+
+
+if __name__ == "__main__":
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else BOARD_SIZE
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DATABASE_DIR
+    for default_pattern in DEFAULT_PARTITIONS[board_size]:
+        print(f"Pattern database written to {write_pattern_database(board_size, default_pattern, output_dir)}")
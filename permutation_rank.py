@@ -0,0 +1,145 @@
+"""
+Perfect hashing of 3x3 boards.
+
+rank() maps a packed board to its Lehmer-code index in 0..9!-1 and
+unrank() inverts it. VisitedBitmap uses the rank as a bit index, so a
+visited/closed set over the whole state space is a fixed 45 KB bytearray.
+Larger boards have far too many permutations for a bitmap, so
+new_visited_set() falls back to a hash set of packed boards for them.
+MoveCodeArray likewise keeps one byte per rank holding the code of the
+move that first reached each board, which is all a breadth-first search
+needs to read its path back; new_move_map() picks it or a dict.
+"""
+
+from math import factorial
+
+from puzzle_state import BOARD_SIZE, CELL_COUNT, CELL_BITS, CELL_MASK
+
+STATE_COUNT = factorial(CELL_COUNT)
+
+# Weight of the i-th Lehmer digit, i.e. (CELL_COUNT - 1 - i)!
+_DIGIT_WEIGHTS = tuple(factorial(CELL_COUNT - 1 - i) for i in range(CELL_COUNT))
+_POPCOUNT = bytes(bin(mask).count("1") for mask in range(1 << CELL_COUNT))
+_LOWER_MASK = tuple((1 << value) - 1 for value in range(CELL_COUNT))
+
+
+def rank(packed):
+    """Lehmer-code rank of a packed board."""
+    result = 0
+    seen = 0
+    for weight in _DIGIT_WEIGHTS:
+        value = packed & CELL_MASK
+        packed >>= CELL_BITS
+        result += (value - _POPCOUNT[seen & _LOWER_MASK[value]]) * weight
+        seen |= 1 << value
+    return result
+
+
+def unrank(index):
+    """Packed board whose rank is `index`."""
+    remaining = list(range(CELL_COUNT))
+    packed = 0
+    shift = 0
+    for weight in _DIGIT_WEIGHTS:
+        digit, index = divmod(index, weight)
+        packed |= remaining.pop(digit) << shift
+        shift += CELL_BITS
+    return packed
+
+
+class VisitedBitmap:
+    """Set of packed boards stored as one bit per permutation rank."""
+
+    __slots__ = ("bits", "count")
+
+    def __init__(self):
+        self.bits = bytearray((STATE_COUNT + 7) >> 3)
+        self.count = 0
+
+    def visit(self, packed):
+        """Mark a board as visited. Returns False if it already was."""
+        index = rank(packed)
+        byte = index >> 3
+        bit = 1 << (index & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def add(self, packed):
+        self.visit(packed)
+
+    def __contains__(self, packed):
+        index = rank(packed)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return self.count
+
+
+class VisitedSet(set):
+    """Hash set of packed boards with the same interface as VisitedBitmap."""
+
+    def visit(self, packed):
+        """Mark a board as visited. Returns False if it already was."""
+        if packed in self:
+            return False
+        self.add(packed)
+        return True
+
+
+class MoveCodeArray:
+    """Map from packed board to move code stored as one byte per permutation rank."""
+
+    __slots__ = ("codes", "count")
+
+    def __init__(self):
+        self.codes = bytearray(STATE_COUNT)  # Move code + 2, 0 for boards not seen yet
+        self.count = 0
+
+    def visit(self, packed, code):
+        """Record the code of the move that reached a board (-1 for a root). Returns False if it was already seen."""
+        index = rank(packed)
+        if self.codes[index]:
+            return False
+        self.codes[index] = code + 2
+        self.count += 1
+        return True
+
+    def __getitem__(self, packed):
+        value = self.codes[rank(packed)]
+        if not value:
+            raise KeyError(packed)
+        return value - 2
+
+    def __contains__(self, packed):
+        return self.codes[rank(packed)] != 0
+
+    def __len__(self):
+        return self.count
+
+
+class MoveCodeMap(dict):
+    """Dict of packed board -> move code with the same interface as MoveCodeArray."""
+
+    def visit(self, packed, code):
+        """Record the code of the move that reached a board (-1 for a root). Returns False if it was already seen."""
+        if packed in self:
+            return False
+        self[packed] = code
+        return True
+
+
+def new_visited_set(size=BOARD_SIZE):
+    """Visited set for size x size boards: a bitmap for 3x3, a hash set otherwise."""
+    if size == BOARD_SIZE:
+        return VisitedBitmap()
+    return VisitedSet()
+
+
+def new_move_map(size=BOARD_SIZE):
+    """Board -> move code map for size x size boards: a rank-indexed array for 3x3, a dict otherwise."""
+    if size == BOARD_SIZE:
+        return MoveCodeArray()
+    return MoveCodeMap()
@@ -0,0 +1,247 @@
+"""
+Opt-in profiling of solver runs.
+
+Nothing in this module touches a solver or PuzzleState until a
+SolverProfiler is started, and everything it installs is removed again
+by stop(), so a solve that is not profiled runs exactly the code it
+always does. There are three modes:
+
+- "timers": counting timers around the hot paths for the length of the
+  run: the solver's successor, heuristic and path methods, the
+  successor functions its module calls, the heuristic object's lookups,
+  and PuzzleState construction, copying, hashing, equality and heap
+  ordering (__lt__). Times are inclusive, so nested calls are counted
+  in both, and they carry the timer's own overhead.
+- "cprofile": the whole run under cProfile, functions ranked by own time.
+- "tracemalloc": allocations traced over the run, source lines ranked by
+  the memory they still held when it ended, plus the traced peak.
+
+A ProfileReport also carries the solver's SearchStats, whose
+phase_times are the per-phase timers every solve already keeps.
+
+    report = profile_solve(AStarSolver(), board, mode="cprofile")
+    print(format_report(report))
+"""
+
+import cProfile
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from puzzle_state import PuzzleState
+from search_control import run_search
+
+PROFILE_MODES = ("timers", "cprofile", "tracemalloc")
+DEFAULT_TOP = 20
+
+# Solver methods, module-level successor functions and heuristic object
+# methods wrapped in "timers" mode, when the solver has them
+SOLVER_METHODS = ("get_possible_moves", "calculate_heuristic", "build_solution_path",
+                  "_reconstruct_bidirectional_path")
+MODULE_FUNCTIONS = ("expand", "apply_moves", "trace_moves")
+HEURISTIC_METHODS = ("distance", "cells_of", "move_delta")
+PUZZLE_STATE_MEMBERS = ("__init__", "from_packed", "slide", "board", "total_cost",
+                        "__hash__", "__eq__", "__lt__")
+
+# count is calls (blocks for "tracemalloc"). total is own seconds for
+# "cprofile" and bytes held for "tracemalloc"; cumulative is inclusive
+# seconds for "cprofile" and "timers". Fields a mode cannot measure are None.
+ProfileEntry = namedtuple("ProfileEntry", ["name", "count", "total", "cumulative"])
+
+# solution_length is None when the run found no solution; peak_memory is
+# only measured in "tracemalloc" mode.
+ProfileReport = namedtuple("ProfileReport", ["mode", "algorithm", "solution_length", "seconds", "stats",
+                                             "entries", "peak_memory"])
+
+
+def _timed(function, counter):
+    """`function` wrapped to add one call and its duration to counter = [calls, seconds]."""
+    perf_counter = time.perf_counter
+
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += perf_counter() - start
+
+    timed.__name__ = getattr(function, "__name__", "timed")
+    timed.__wrapped__ = function
+    return timed
+
+
+def _timed_descriptor(descriptor, counter):
+    """Class attribute `descriptor` (function, classmethod, staticmethod or property) with a timer."""
+    if isinstance(descriptor, classmethod):
+        return classmethod(_timed(descriptor.__func__, counter))
+    if isinstance(descriptor, staticmethod):
+        return staticmethod(_timed(descriptor.__func__, counter))
+    if isinstance(descriptor, property):
+        return property(_timed(descriptor.fget, counter), descriptor.fset, descriptor.fdel, descriptor.__doc__)
+    return _timed(descriptor, counter)
+
+
+class SolverProfiler:
+    """
+    Profiles one solver run in the given mode.
+
+    start() installs the instrumentation and stop() removes it and returns
+    the ProfileReport. A caller that runs solve_iter() in slices, like the
+    GUI, can pause() and resume() around its own work in between; only
+    cProfile actually stops recording while paused.
+    """
+
+    def __init__(self, solver, mode="timers", top=DEFAULT_TOP):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {', '.join(PROFILE_MODES)}")
+        self.solver = solver
+        self.mode = mode
+        self.top = top
+        self.seconds = 0.0
+        self._counters = {}
+        self._restore = []  # (owner, name, original or None to delete) for every patch
+        self._profile = None
+        self._owns_tracemalloc = False
+        self._running_since = None
+
+    def start(self):
+        if self.mode == "timers":
+            self._install_timers()
+        elif self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+        elif not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self.resume()
+
+    def pause(self):
+        if self._running_since is None:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+        self.seconds += time.perf_counter() - self._running_since
+        self._running_since = None
+
+    def resume(self):
+        if self._running_since is not None:
+            return
+        self._running_since = time.perf_counter()
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self, solution=None):
+        """Remove the instrumentation and report on the run that produced `solution`."""
+        self.pause()
+        peak_memory = None
+        if self.mode == "timers":
+            self._uninstall_timers()
+            entries = self._timer_entries()
+        elif self.mode == "cprofile":
+            entries = self._cprofile_entries()
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+            entries = self._tracemalloc_entries(snapshot)
+        return ProfileReport(self.mode, type(self.solver).__name__,
+                             None if solution is None else len(solution) - 1,
+                             self.seconds, getattr(self.solver, "stats", None), entries, peak_memory)
+
+    def _patch(self, owner, name, replacement):
+        self._restore.append((owner, name, vars(owner).get(name) if isinstance(owner, type) else None))
+        setattr(owner, name, replacement)
+
+    def _install_timers(self):
+        solver = self.solver
+        for name in SOLVER_METHODS:
+            method = getattr(solver, name, None)
+            if method is not None:
+                label = f"{type(solver).__name__}.{name}"
+                self._patch(solver, name, _timed(method, self._counters.setdefault(label, [0, 0.0])))
+        module = sys.modules.get(type(solver).__module__)
+        for name in MODULE_FUNCTIONS:
+            function = getattr(module, name, None)
+            if function is not None:
+                label = f"{function.__module__}.{name}"
+                self._restore.append((module, name, function))
+                setattr(module, name, _timed(function, self._counters.setdefault(label, [0, 0.0])))
+        heuristic = getattr(solver, "heuristic", None)
+        for name in HEURISTIC_METHODS if heuristic is not None else ():
+            method = getattr(heuristic, name, None)
+            if method is not None:
+                label = f"{type(heuristic).__name__}.{name}"
+                self._patch(heuristic, name, _timed(method, self._counters.setdefault(label, [0, 0.0])))
+        for name in PUZZLE_STATE_MEMBERS:
+            label = f"PuzzleState.{name}"
+            descriptor = _timed_descriptor(vars(PuzzleState)[name], self._counters.setdefault(label, [0, 0.0]))
+            self._patch(PuzzleState, name, descriptor)
+
+    def _uninstall_timers(self):
+        while self._restore:
+            owner, name, original = self._restore.pop()
+            if original is None:
+                # Instance attribute shadowing the class method
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+
+    def _timer_entries(self):
+        entries = [ProfileEntry(label, calls, None, seconds)
+                   for label, (calls, seconds) in self._counters.items() if calls]
+        entries.sort(key=lambda entry: entry.cumulative, reverse=True)
+        return entries[:self.top]
+
+    def _cprofile_entries(self):
+        entries = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in pstats.Stats(self._profile).stats.items():
+            name = function if filename == "~" else f"{filename.rsplit('/', 1)[-1]}:{line}({function})"
+            entries.append(ProfileEntry(name, calls, own, cumulative))
+        entries.sort(key=lambda entry: entry.total, reverse=True)
+        return entries[:self.top]
+
+    def _tracemalloc_entries(self, snapshot):
+        snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        return [ProfileEntry(f"{stat.traceback[0].filename.rsplit('/', 1)[-1]}:{stat.traceback[0].lineno}",
+                             stat.count, stat.size, None)
+                for stat in snapshot.statistics("lineno")[:self.top]]
+
+
+def profile_solve(solver, initial_board, mode="timers", limits=None, top=DEFAULT_TOP):
+    """Solve `initial_board` under a SolverProfiler and return its ProfileReport."""
+    profiler = SolverProfiler(solver, mode, top)
+    profiler.start()
+    solution = None
+    try:
+        solution = run_search(solver.solve_iter(initial_board, limits))
+    finally:
+        report = profiler.stop(solution)
+    return report
+
+
+def format_report(report):
+    """Plain-text table of a ProfileReport."""
+    lines = [f"{report.algorithm} profiled with {report.mode}: {report.seconds:.3f}s, "
+             + ("no solution" if report.solution_length is None else f"{report.solution_length} moves")]
+    if report.stats is not None:
+        stats = report.stats
+        phases = ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in stats.phase_times.items())
+        lines.append(f"expanded {stats.expanded:,}, generated {stats.generated:,}, "
+                     f"duplicates {stats.duplicates:,}, max frontier {stats.max_frontier:,}; {phases}")
+    if report.peak_memory is not None:
+        lines.append(f"traced peak memory {report.peak_memory:,} bytes")
+    lines.append("")
+    if report.mode == "tracemalloc":
+        lines.append(f"{'blocks':>10} {'bytes':>12}  line")
+        lines.extend(f"{entry.count:>10,} {entry.total:>12,}  {entry.name}" for entry in report.entries)
+    elif report.mode == "cprofile":
+        lines.append(f"{'calls':>10} {'own s':>9} {'cum s':>9}  function")
+        lines.extend(f"{entry.count:>10,} {entry.total:>9.4f} {entry.cumulative:>9.4f}  {entry.name}"
+                     for entry in report.entries)
+    else:
+        lines.append(f"{'calls':>10} {'incl s':>9}  function")
+        lines.extend(f"{entry.count:>10,} {entry.cumulative:>9.4f}  {entry.name}" for entry in report.entries)
+    return "\n".join(lines)
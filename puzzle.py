@@ -0,0 +1,282 @@
+"""
+Headless command line for the solvers.
+
+    python -m puzzle solve [--algorithm astar] [--input boards.jsonl] [--output results.jsonl]
+                           [--workers 4] [--time-limit 10] [--max-expansions N] [--max-memory BYTES]
+                           [--option beam_width=200] [--cache solutions.sqlite]
+
+Boards are read as JSON lines from --input or stdin: either a board,
+as rows ([[1, 2, 3], [4, 5, 6], [7, 8, 0]]) or flat ([1, 2, 3, ..., 0]),
+or an object {"id": ..., "board": ...} whose id is echoed back. The size
+comes from each board. One JSON line per board is written to --output
+or stdout, in input order, as soon as it and every board before it are
+done. Each result carries the 0-based input line as "index", the move
+string, the counters and SearchStats of the solve, or an "error" for
+lines that are not a board or boards that cannot be solved.
+
+Input is read lazily and at most a few boards per worker are in flight,
+so memory stays bounded however long the stream is. With --workers > 1
+boards are solved in a process pool, one solver per algorithm and size
+in each worker. With --cache, the parent process answers repeated boards
+from a solution_cache.SolutionCache before anything is submitted.
+
+Nothing here imports tkinter, so it runs on machines without a display.
+"""
+
+import argparse
+import inspect
+import json
+import math
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from puzzle_state import BOARD_SIZE, PuzzleState
+from solvability import check_solvability
+from search_control import SearchLimits
+from solution_path import SolutionPath
+from solution_cache import SolutionCache, decode_moves, solver_options
+from batch_solver import SOLVERS
+from pattern_database import PatternDatabase
+
+IN_FLIGHT_PER_WORKER = 4  # Boards submitted ahead of the output per worker process
+
+# --option heuristic=<name> -> heuristic factory taking the board size; None is Manhattan distance
+HEURISTICS = {"manhattan": None, "pdb": PatternDatabase}
+
+# (algorithm, size, options) -> solver, kept per process so tables are built once
+_solvers = {}
+
+
+def parse_board(value):
+    """Rows of a board given as rows or as a flat list of a square number of tiles."""
+    if not isinstance(value, list) or not value:
+        raise ValueError("Board must be a non-empty list")
+    if all(isinstance(row, list) for row in value):
+        rows = value
+    else:
+        size = math.isqrt(len(value))
+        if size * size != len(value):
+            raise ValueError(f"A flat board needs a square number of tiles, got {len(value)}")
+        rows = [value[row * size:(row + 1) * size] for row in range(size)]
+    for row in rows:
+        for tile in row:
+            # bool is an int subclass, but true/false are not tiles
+            if not isinstance(tile, int) or isinstance(tile, bool):
+                raise ValueError(f"Tiles must be integers, got {json.dumps(tile)}")
+    return rows
+
+
+def parse_line(line):
+    """(id, board) of one input line; id is None for a bare board."""
+    value = json.loads(line)
+    if isinstance(value, dict):
+        if "board" not in value:
+            raise ValueError('Object lines need a "board"')
+        return value.get("id"), parse_board(value["board"])
+    return None, parse_board(value)
+
+
+def parse_option(text):
+    """name=value, with the value read as JSON when it parses (numbers, lists) and as a string otherwise."""
+    name, separator, value = text.partition("=")
+    if not separator or not name:
+        raise argparse.ArgumentTypeError(f"Options must look like name=value, got {text!r}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def solver_size(algorithm, size):
+    """Board size the solver for `algorithm` handles; the table solver only knows 3x3 boards."""
+    return BOARD_SIZE if algorithm == "table" else size
+
+
+def option_names(algorithm):
+    """Solver constructor keywords --option can set; the size always comes from the board."""
+    return [name for name in inspect.signature(SOLVERS[algorithm]).parameters if name != "size"]
+
+
+def check_options(algorithm, options):
+    """Raise ValueError for options the solver for `algorithm` does not take."""
+    accepted = option_names(algorithm)
+    unknown = [name for name in options if name not in accepted]
+    if unknown:
+        raise ValueError(f"unknown option {', '.join(unknown)} for {algorithm}, "
+                         f"accepted: {', '.join(accepted) or 'none'}")
+    if "heuristic" in options and options["heuristic"] not in HEURISTICS:
+        raise ValueError(f"unknown heuristic {options['heuristic']!r}, accepted: {', '.join(HEURISTICS)}")
+
+
+def get_solver(algorithm, size, options):
+    key = (algorithm, size, tuple(sorted(options.items())))
+    solver = _solvers.get(key)
+    if solver is None:
+        if "heuristic" in options:
+            heuristic = HEURISTICS[options["heuristic"]]
+            options = dict(options, heuristic=None if heuristic is None else heuristic(size))
+        solver = SOLVERS[algorithm](**options) if algorithm == "table" else SOLVERS[algorithm](size=size, **options)
+        _solvers[key] = solver
+    return solver
+
+
+def solve_record(index, record_id, board, algorithm, options, limits):
+    """
+    Solve one board and return its output record. Runs in worker processes
+    too. Anything the solve raises becomes an "error" record, so one bad
+    board never stops the stream.
+    """
+    try:
+        return _solve_record(index, record_id, board, algorithm, options, limits)
+    except Exception as error:
+        return {"index": index, "id": record_id, "board": board, "error": f"{type(error).__name__}: {error}"}
+
+
+def _solve_record(index, record_id, board, algorithm, options, limits):
+    record = {"index": index, "id": record_id, "board": board}
+    size = solver_size(algorithm, len(board))
+    if size != len(board):
+        record["error"] = f"{algorithm} solver supports {size}x{size} only"
+        return record
+    solvability = check_solvability(board)
+    if not solvability.solvable:
+        record.update(solvable=False, error=solvability.reason)
+        return record
+    solver = get_solver(algorithm, len(board), options)
+    solution = solver.solve(board, limits)
+    record.update(solvable=True,
+                  moves=None if solution is None else solution.move_string,
+                  length=None if solution is None else len(solution) - 1,
+                  stopped=None if solver.partial_result is None else solver.partial_result.reason,
+                  nodes_explored=solver.nodes_explored,
+                  visited_nodes=solver.visited_nodes,
+                  stats=solver.stats.as_dict(),
+                  cached=False)
+    return record
+
+
+def cached_record(index, record_id, board, moves):
+    solution = SolutionPath(PuzzleState(board=board), moves)
+    return {"index": index, "id": record_id, "board": board, "solvable": True,
+            "moves": solution.move_string, "length": len(solution) - 1, "stopped": None,
+            "nodes_explored": 0, "visited_nodes": 0, "stats": None, "cached": True}
+
+
+def solve_stream(lines, algorithm="astar", options=None, limits=None, workers=1, cache=None):
+    """
+    Yield one output record per input line, in input order. With
+    workers > 1 at most IN_FLIGHT_PER_WORKER boards per worker are
+    pending at any time.
+    """
+    options = options or {}
+    check_options(algorithm, options)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # Records or futures of records, oldest first
+    pending = deque()
+    max_pending = workers * IN_FLIGHT_PER_WORKER
+    cache_options = None
+    try:
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                record_id, board = parse_line(line)
+            except ValueError as error:
+                pending.append({"index": index, "id": None, "error": str(error)})
+            else:
+                moves = None
+                key = None
+                if cache is not None and check_solvability(board).solvable:
+                    if cache_options is None:
+                        cache_options = solver_options(get_solver(algorithm, len(board), options))
+                    key = cache.key(board, algorithm, cache_options)
+                    moves = cache.get(key)
+                if moves is not None:
+                    pending.append(cached_record(index, record_id, board, moves))
+                elif executor is not None:
+                    future = executor.submit(solve_record, index, record_id, board, algorithm, options, limits)
+                    pending.append((future, key))
+                else:
+                    pending.append((solve_record(index, record_id, board, algorithm, options, limits), key))
+            while len(pending) > max_pending or (pending and _is_done(pending[0])):
+                yield _finish(pending.popleft(), cache)
+        while pending:
+            yield _finish(pending.popleft(), cache)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _is_done(item):
+    if isinstance(item, dict):
+        return True
+    result, _ = item
+    return isinstance(result, dict) or result.done()
+
+
+def _finish(item, cache):
+    """Record for a pending item, waiting for it if needed and caching a new solution."""
+    if isinstance(item, dict):
+        return item
+    result, key = item
+    record = result if isinstance(result, dict) else result.result()
+    if key is not None and record.get("moves") is not None and record["stopped"] is None:
+        cache.put(key, decode_moves(record["moves"]))
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzle", description="Headless sliding puzzle solver.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    solve = commands.add_parser("solve", help="solve boards read as JSON lines")
+    solve.add_argument("--algorithm", default="astar", choices=list(SOLVERS))
+    solve.add_argument("--input", default="-", help="JSON lines file of boards, - for stdin")
+    solve.add_argument("--output", default="-", help="JSON lines file for the results, - for stdout")
+    solve.add_argument("--workers", type=int, default=1, help="worker processes")
+    solve.add_argument("--time-limit", type=float, help="seconds per board")
+    solve.add_argument("--max-expansions", type=int, help="node expansions per board")
+    solve.add_argument("--max-memory", type=int, help="estimated bytes per board")
+    solve.add_argument("--option", type=parse_option, action="append", default=[],
+                       help="solver constructor option as name=value, e.g. beam_width=200 or "
+                            f"heuristic={'|'.join(HEURISTICS)}; repeatable")
+    solve.add_argument("--cache", help="SQLite file of a solution cache shared across runs")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    options = dict(args.option)
+    try:
+        check_options(args.algorithm, options)
+        # Catch bad option values here rather than in every worker
+        get_solver(args.algorithm, BOARD_SIZE, options)
+    except (TypeError, ValueError) as error:
+        parser.error(f"invalid --option for {args.algorithm}: {error}")
+    limits = SearchLimits(time_limit=args.time_limit, max_expansions=args.max_expansions,
+                          max_memory=args.max_memory)
+    try:
+        input_file = sys.stdin if args.input == "-" else open(args.input)
+    except OSError as error:
+        parser.error(f"cannot read --input: {error}")
+    try:
+        output_file = sys.stdout if args.output == "-" else open(args.output, "w")
+    except OSError as error:
+        if input_file is not sys.stdin:
+            input_file.close()
+        parser.error(f"cannot write --output: {error}")
+    cache = SolutionCache(path=args.cache) if args.cache else None
+    try:
+        for record in solve_stream(input_file, args.algorithm, options, limits, args.workers, cache):
+            output_file.write(json.dumps(record) + "\n")
+            output_file.flush()
+    finally:
+        if cache is not None:
+            cache.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,119 @@
+BOARD_SIZE = 3
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+CELL_BITS = 4
+CELL_MASK = (1 << CELL_BITS) - 1
+
+
+def cell_bits(size):
+    """Bits used per cell when packing a size x size board (at least 4)."""
+    return max(CELL_BITS, (size * size - 1).bit_length())
+
+
+def goal_board(size=BOARD_SIZE):
+    """Goal board for a size x size puzzle: 1..N*N-1 in order, blank last."""
+    values = list(range(1, size * size)) + [0]
+    return [values[row * size:(row + 1) * size] for row in range(size)]
+
+
+def pack_board(board):
+    """Pack a list-of-lists board into a single integer, row-major from the low bits."""
+    bits = cell_bits(len(board))
+    packed = 0
+    shift = 0
+    for row in board:
+        for value in row:
+            packed |= value << shift
+            shift += bits
+    return packed
+
+
+def unpack_board(packed, size=BOARD_SIZE):
+    """Unpack an integer produced by pack_board back into a list-of-lists board."""
+    bits = cell_bits(size)
+    mask = (1 << bits) - 1
+    cells = [(packed >> (bits * index)) & mask for index in range(size * size)]
+    return [cells[row * size:(row + 1) * size] for row in range(size)]
+
+
 class PuzzleState:
-    
+    __slots__ = ("packed", "blank", "size", "g", "h", "parent", "move")
+
     def __init__(self, board, g=0, h=0, parent=None, move=""):
-        self.board = [row[:] for row in board]  # Deep copy of the board
+        self.size = len(board)  # Board width and height
+        self.packed = pack_board(board)  # Board packed into one int, see pack_board
+        self.blank = [value for row in board for value in row].index(0)  # Flat index of the blank cell
         self.g = g  # Cost to reach this state
         self.h = h  # Heuristic cost to reach goal
         self.parent = parent  # Parent state
         self.move = move  # Move taken to reach this state
-    
+
+    @classmethod
+    def from_packed(cls, packed, blank, size=BOARD_SIZE, g=0, h=0, parent=None, move=""):
+        """Build a state directly from a packed board without unpacking it."""
+        state = cls.__new__(cls)
+        state.packed = packed
+        state.blank = blank
+        state.size = size
+        state.g = g
+        state.h = h
+        state.parent = parent
+        state.move = move
+        return state
+
+    @property
+    def board(self):
+        """The board as a fresh list of lists."""
+        return unpack_board(self.packed, self.size)
+
+    @property
+    def tiles(self):
+        """The board as a fresh flat row-major list."""
+        bits = cell_bits(self.size)
+        mask = (1 << bits) - 1
+        return [(self.packed >> (bits * index)) & mask for index in range(self.size * self.size)]
+
     @property
     def total_cost(self):
         return self.g + self.h
-    
+
+    def tile_at(self, index):
+        """Value of the tile at the given flat cell index."""
+        bits = cell_bits(self.size)
+        return (self.packed >> (bits * index)) & ((1 << bits) - 1)
+
+    def slide(self, target, g=0, h=0, move=""):
+        """Return the child state reached by swapping the blank with the tile at `target`."""
+        bits = cell_bits(self.size)
+        tile = self.tile_at(target)
+        packed = self.packed ^ (tile << (bits * target)) | (tile << (bits * self.blank))
+        return PuzzleState.from_packed(packed, target, self.size, g=g, h=h, parent=self, move=move)
+
     def find_blank_position(self):
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return (-1, -1)
-    
+        return divmod(self.blank, self.size)
+
     def __hash__(self):
-        hash_value = 0
-        for i in range(3):
-            for j in range(3):
-                hash_value = hash_value * 10 + self.board[i][j]
-        return hash_value
-    
+        return hash(self.packed)
+
     def __eq__(self, other):
         if other is None or not isinstance(other, PuzzleState):
             return False
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] != other.board[i][j]:
-                    return False
-        return True
-    
+        return self.packed == other.packed and self.size == other.size
+
     def __lt__(self, other):
         return self.total_cost < other.total_cost
-    
+
     def display_board(self):
         """Print the puzzle board in a formatted way."""
-        print("-------------")
-        for i in range(3):
+        board = self.board
+        width = len(str(self.size * self.size - 1))
+        separator = "-" * (self.size * (width + 3) + 1)
+        print(separator)
+        for i in range(self.size):
             print("| ", end="")
-            for j in range(3):
-                if self.board[i][j] == 0:
-                    print("  | ", end="")
+            for j in range(self.size):
+                if board[i][j] == 0:
+                    print(" " * width + " | ", end="")
                 else:
-                    print(f"{self.board[i][j]} | ", end="")
+                    print(f"{board[i][j]:>{width}} | ", end="")
             print()
-            print("-------------")
+            print(separator)
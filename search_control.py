@@ -0,0 +1,199 @@
+"""
+Search limits, cooperative cancellation and partial results.
+
+A solve() can be bounded by SearchLimits: a wall-clock time limit or
+absolute deadline (time.monotonic() seconds), a maximum number of node
+expansions, and a memory cap. The memory cap is checked against the
+number of boards the search is holding, at a rough STORED_NODE_BYTES
+each, so it is an estimate rather than a measurement.
+
+Solvers compare their expansion count against SearchBudget.next_check
+before counting the next expansion and only call check() when it is
+reached: once before the first expansion and then at most every
+CHECK_INTERVAL expansions. So max_expansions is a hard cap, a deadline
+that has already passed stops the search before it expands anything,
+and the limits cost next to nothing in the hot loop. The same check
+picks up a cancel() from another thread. When a search stops early
+it returns None and leaves a PartialResult in the solver's
+`partial_result` attribute.
+
+Each solver's solve_iter() yields a SearchProgress snapshot at every
+check and a final one with done=True and the solution; solve() just runs
+it to completion. A caller can pace, interleave or drop a search between
+snapshots without threads.
+
+Every solve also leaves a SearchStats in the solver's `stats` attribute,
+with the same counter definitions for every algorithm. The counters are
+plain attribute updates, at most one per expansion or per discarded
+duplicate, so they are always on; solvers no longer print as they go.
+"""
+
+import time
+from collections import namedtuple
+
+CHECK_INTERVAL = 1024
+STORED_NODE_BYTES = 256
+
+SearchLimits = namedtuple("SearchLimits", ["time_limit", "max_expansions", "max_memory", "deadline"],
+                          defaults=(None, None, None, None))
+
+# reason is "cancelled", "time", "expansions" or "memory". best_path is
+# the path to the most promising board reached, when the solver has one;
+# f_bound is the solver's own progress measure (lowest f, depth or bound).
+PartialResult = namedtuple("PartialResult", ["reason", "best_path", "frontier_size", "f_bound",
+                                             "nodes_explored", "visited_nodes", "elapsed"])
+
+# frontier_size and f_bound mean the same as in PartialResult; solution is
+# only set on the final snapshot, where done is True.
+SearchProgress = namedtuple("SearchProgress", ["done", "nodes_explored", "frontier_size", "f_bound",
+                                               "elapsed", "solution"], defaults=(None,))
+
+
+class SearchStopped(Exception):
+    """Raised inside nested searches to unwind to solve() once a limit is hit."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class SearchStats:
+    """
+    Counters and timings of one solve().
+
+    expanded: boards taken off the frontier and goal-tested (the solver's
+        nodes_explored).
+    generated: children produced by move generation. The move that undoes
+        the parent's move is never generated.
+    duplicates: generated boards dropped because the search already held
+        them: visited, closed, on the current path, or known with a g no
+        worse.
+    max_frontier: most boards waiting to be expanded at once (open list,
+        stack or BFS layers; the current path for IDDFS and IDA*).
+    max_depth: largest g of an expanded board.
+    heuristic_evaluations: h values computed, in full or incrementally.
+    phase_times: wall-clock seconds of "setup" (solvability check and
+        first h), "search" and "path" (reading the solution back). Time a
+        solve_iter() spends suspended at a yield counts towards its phase.
+    peak_memory: estimated bytes at the most boards held, STORED_NODE_BYTES
+        each as for SearchLimits.max_memory, sampled at every check and at
+        the end of the search.
+    """
+
+    __slots__ = ("expanded", "generated", "duplicates", "max_frontier", "max_depth",
+                 "heuristic_evaluations", "phase_times", "peak_memory", "_phase", "_phase_start")
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.max_depth = 0
+        self.heuristic_evaluations = 0
+        self.phase_times = {}
+        self.peak_memory = 0
+        self._phase = None
+        self._phase_start = 0.0
+
+    def phase(self, name):
+        """End the current phase, if any, and start timing `name`."""
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phase_times[self._phase] = self.phase_times.get(self._phase, 0.0) + now - self._phase_start
+        self._phase = name
+        self._phase_start = now
+
+    def held(self, stored_nodes):
+        """Record that the search holds `stored_nodes` boards right now."""
+        if stored_nodes * STORED_NODE_BYTES > self.peak_memory:
+            self.peak_memory = stored_nodes * STORED_NODE_BYTES
+
+    @property
+    def elapsed(self):
+        return sum(self.phase_times.values())
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"SearchStats({fields})"
+
+
+class SearchBudget:
+    """Tracks one solve() against its SearchLimits and collects its SearchStats."""
+
+    def __init__(self, limits=None, interval=CHECK_INTERVAL):
+        limits = limits or SearchLimits()
+        self.interval = interval
+        self.stats = SearchStats()
+        self.stats.phase("setup")
+        self.start = time.monotonic()
+        self.deadline = limits.deadline
+        if limits.time_limit is not None:
+            time_limit_deadline = self.start + limits.time_limit
+            if self.deadline is None or time_limit_deadline < self.deadline:
+                self.deadline = time_limit_deadline
+        self.max_expansions = limits.max_expansions
+        self.max_stored_nodes = None if limits.max_memory is None else limits.max_memory // STORED_NODE_BYTES
+        # Check once before the first expansion, so a deadline that has already passed stops at once
+        self.next_check = 0
+
+    def _next_check_after(self, nodes_explored):
+        next_check = nodes_explored + self.interval
+        if self.max_expansions is not None and nodes_explored <= self.max_expansions:
+            # Land exactly on the budget, before the expansion that would exceed it
+            next_check = min(next_check, self.max_expansions)
+        return next_check
+
+    def check(self, cancel_requested, nodes_explored, stored_nodes=0):
+        """
+        Name of the limit that stops the search now, or None to keep going.
+        `nodes_explored` counts the expansions already made, not the next one.
+        """
+        self.next_check = self._next_check_after(nodes_explored)
+        self.stats.held(stored_nodes)
+        if cancel_requested:
+            return "cancelled"
+        if self.max_expansions is not None and nodes_explored >= self.max_expansions:
+            return "expansions"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "time"
+        if self.max_stored_nodes is not None and stored_nodes > self.max_stored_nodes:
+            return "memory"
+        return None
+
+    def progress(self, nodes_explored, frontier_size=None, f_bound=None):
+        """Snapshot for solve_iter() to yield after a check that let the search go on."""
+        return SearchProgress(False, nodes_explored, frontier_size, f_bound, self.elapsed)
+
+    def finished(self, solver, solution, stored_nodes=None):
+        """
+        Final snapshot of a solve_iter(). Closes the solver's SearchStats,
+        taking the boards still held from `stored_nodes` or, by default,
+        the solver's visited_nodes.
+        """
+        stats = self.stats
+        stats.phase(None)
+        stats.expanded = solver.nodes_explored
+        stats.held(solver.visited_nodes if stored_nodes is None else stored_nodes)
+        return SearchProgress(True, solver.nodes_explored, None, None, self.elapsed, solution)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+
+def stop_search(solver, reason, budget, best_path=None, frontier_size=None, f_bound=None):
+    """Record a PartialResult on `solver` for a search that stopped early. Returns None."""
+    solver.cancelled = reason == "cancelled"
+    solver.partial_result = PartialResult(reason, best_path, frontier_size, f_bound,
+                                          solver.nodes_explored, solver.visited_nodes, budget.elapsed)
+    return None
+
+
+def run_search(search):
+    """Run a solve_iter() generator to the end and return its solution."""
+    for progress in search:
+        pass
+    return progress.solution
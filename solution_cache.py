@@ -0,0 +1,219 @@
+"""
+Solution cache in front of the solvers.
+
+Solutions are keyed by (size, board, algorithm, options). The board part
+is the permutation rank for 3x3 boards and the packed board otherwise, so
+equal boards always share a key however they were entered. The options
+part is a canonical string of the solver settings that can change the
+answer: the heuristic and bounds such as max_depth or beam_width.
+
+The first tier is an in-memory LRU of move code strings that evicts the
+least recently used entry once it holds max_entries. An optional second
+tier is a SQLite file storing each solution as its one-letter move string
+(e.g. "ULDR"); memory misses fall through to it and disk hits are
+promoted back into memory. Only complete solutions are cached: boards a
+solver gave up on, by a limit, a cancel or its own depth bound, are
+searched again next time.
+
+CachedSolver wraps any solver with the usual solve()/solve_iter()
+interface, so a cache hit skips the search entirely:
+
+    cache = SolutionCache(path="solutions.sqlite")
+    solver = CachedSolver(AStarSolver(), cache, "astar")
+    solver.solve(board)
+    print(cache.counters())
+"""
+
+import sqlite3
+from collections import OrderedDict, namedtuple
+
+from puzzle_state import BOARD_SIZE, PuzzleState
+from permutation_rank import rank
+from solvability import check_solvability
+from search_control import CHECK_INTERVAL, SearchBudget, run_search
+from solution_path import SolutionPath
+from successors import MOVE_NAMES
+
+DEFAULT_MAX_ENTRIES = 10000
+COMMIT_INTERVAL = 256  # Disk writes per SQLite commit; close() commits the rest
+
+# Solver attributes that change which solution a solver returns
+OPTION_ATTRIBUTES = ("max_depth", "beam_width", "dedup_size", "table_path")
+
+_MOVE_LETTERS = {move_name[0]: code for code, move_name in enumerate(MOVE_NAMES)}
+
+# memory_hits and disk_hits add up to all hits; evictions count entries
+# pushed out of the memory tier (they stay on disk when there is one)
+CacheStats = namedtuple("CacheStats", ["memory_hits", "disk_hits", "misses", "evictions", "entries"])
+
+
+def board_key(board):
+    """Canonical key of a board: its permutation rank for 3x3, its packed int otherwise."""
+    packed = PuzzleState(board=board).packed
+    return rank(packed) if len(board) == BOARD_SIZE else packed
+
+
+def solver_options(solver):
+    """Canonical string of the solver settings that can change its answer."""
+    options = {name: getattr(solver, name) for name in OPTION_ATTRIBUTES if hasattr(solver, name)}
+    heuristic = getattr(solver, "heuristic", None)
+    if heuristic is not None:
+        options["heuristic"] = type(heuristic).__name__
+        partition = getattr(heuristic, "partition", None)
+        if partition is not None:
+            options["partition"] = partition
+    return ",".join(f"{name}={value!r}" for name, value in sorted(options.items()))
+
+
+def encode_moves(moves):
+    """Move codes as one letter per move, e.g. b"\\x00\\x03" -> "UR"."""
+    return "".join(MOVE_NAMES[code][0] for code in moves)
+
+
+def decode_moves(letters):
+    return bytes(_MOVE_LETTERS[letter] for letter in letters)
+
+
+class SolutionCache:
+    """LRU of solution move strings with an optional SQLite tier at `path`."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()  # key -> move codes, least recently used first
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.connection = None
+        self._pending_writes = 0
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solutions ("
+                                    "size INTEGER, board TEXT, algorithm TEXT, options TEXT, moves TEXT NOT NULL, "
+                                    "PRIMARY KEY (size, board, algorithm, options))")
+
+    def key(self, board, algorithm, options=""):
+        return len(board), board_key(board), algorithm, options
+
+    def get(self, key):
+        """Move codes cached for `key`, or None."""
+        moves = self.entries.get(key)
+        if moves is not None:
+            self.entries.move_to_end(key)
+            self.memory_hits += 1
+            return moves
+        if self.connection is not None:
+            row = self.connection.execute("SELECT moves FROM solutions "
+                                          "WHERE size = ? AND board = ? AND algorithm = ? AND options = ?",
+                                          self._row_key(key)).fetchone()
+            if row is not None:
+                moves = decode_moves(row[0])
+                self._remember(key, moves)
+                self.disk_hits += 1
+                return moves
+        self.misses += 1
+        return None
+
+    def put(self, key, moves):
+        """Cache the move codes of a complete solution."""
+        moves = bytes(moves)
+        self._remember(key, moves)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)",
+                                    self._row_key(key) + (encode_moves(moves),))
+            self._pending_writes += 1
+            if self._pending_writes >= COMMIT_INTERVAL:
+                self.flush()
+
+    @staticmethod
+    def _row_key(key):
+        size, board, algorithm, options = key
+        # Packed 4x4 boards overflow SQLite's 64-bit signed integers, so boards are stored as text
+        return size, str(board), algorithm, options
+
+    def _remember(self, key, moves):
+        self.entries[key] = moves
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def counters(self):
+        return CacheStats(self.memory_hits, self.disk_hits, self.misses, self.evictions, len(self.entries))
+
+    def flush(self):
+        """Commit pending disk writes."""
+        if self.connection is not None and self._pending_writes:
+            self.connection.commit()
+            self._pending_writes = 0
+
+    def close(self):
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CachedSolver:
+    """
+    A solver behind a SolutionCache. Misses run the wrapped solver and
+    cache its solution; hits return it without searching, leaving the
+    wrapped solver's counters at zero. Every other attribute is the
+    wrapped solver's.
+    """
+
+    def __init__(self, solver, cache, algorithm=None, options=None):
+        self.solver = solver
+        self.cache = cache
+        self.algorithm = algorithm or type(solver).__name__
+        self.options = solver_options(solver) if options is None else options
+
+    def __getattr__(self, name):
+        return getattr(self.solver, name)
+
+    def solve(self, initial_board, limits=None):
+        """The wrapped solver's solve(), answered from the cache when possible."""
+        return run_search(self.solve_iter(initial_board, limits))
+
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """
+        The wrapped solver's solve_iter(); a hit yields only the final snapshot.
+        Invalid and unsolvable boards go straight to the wrapped solver,
+        without a lookup, so they report their SolvabilityResult as usual.
+        """
+        solver = self.solver
+        if not check_solvability(initial_board, getattr(solver, "size", BOARD_SIZE)).solvable:
+            return (yield from solver.solve_iter(initial_board, limits, interval))
+        key = self.cache.key(initial_board, self.algorithm, self.options)
+        moves = self.cache.get(key)
+        if moves is None:
+            for progress in solver.solve_iter(initial_board, limits, interval):
+                # Cache before handing the result on, in case the caller stops at the final snapshot
+                if progress.solution is not None and getattr(solver, "partial_result", None) is None:
+                    self.cache.put(key, progress.solution.moves)
+                yield progress
+            return
+
+        budget = SearchBudget(limits, interval)
+        solver.stats = budget.stats
+        solver.solvability = check_solvability(initial_board, getattr(solver, "size", BOARD_SIZE))
+        solver.nodes_explored = 0
+        solver.visited_nodes = 0
+        solver.partial_result = None
+        solver.cancelled = False
+        yield budget.finished(solver, self._solution_path(initial_board, moves))
+
+    def _solution_path(self, initial_board, moves):
+        solver = self.solver
+        h = solver.calculate_heuristic(initial_board) if hasattr(solver, "calculate_heuristic") else 0
+        return SolutionPath(PuzzleState(board=initial_board, g=0, h=h), moves,
+                            getattr(solver, "h_delta", None), getattr(solver, "heuristic", None))
@@ -0,0 +1,66 @@
+"""
+Solutions stored as move strings.
+
+A solution is kept as its start state plus one 2-bit move code per step
+(a bytes string). SolutionPath still behaves like the list of PuzzleState
+objects every solver used to return, but builds those states only when a
+caller indexes or iterates it, e.g. display_solution() or the visualizer.
+A finished search therefore holds on to a few bytes per move rather than
+a chain of states.
+"""
+
+from collections.abc import Sequence
+
+from puzzle_state import PuzzleState
+from successors import apply_moves, MOVE_CODES, MOVE_NAMES
+
+
+class SolutionPath(Sequence):
+    """Start state and move codes, read as the sequence of states along the path."""
+
+    def __init__(self, initial_state, moves=b"", h_delta=None, heuristic=None):
+        # Copy the start without its parent so the search tree can be freed
+        self.initial_state = PuzzleState.from_packed(initial_state.packed, initial_state.blank, initial_state.size,
+                                                     initial_state.g, initial_state.h)
+        self.moves = bytes(moves)  # One move code per step, see successors.MOVE_NAMES
+        self.h_delta = h_delta  # h bookkeeping for materialized states, as in apply_moves()
+        self.heuristic = heuristic
+        self._states = None
+
+    @classmethod
+    def from_state(cls, state, h_delta=None, heuristic=None):
+        """Path from the root of a parent-linked PuzzleState chain to `state`."""
+        codes = []
+        while state.parent is not None:
+            codes.append(MOVE_CODES[state.move])
+            state = state.parent
+        codes.reverse()
+        return cls(state, codes, h_delta, heuristic)
+
+    @classmethod
+    def from_names(cls, initial_state, move_names, h_delta=None, heuristic=None):
+        return cls(initial_state, [MOVE_CODES[move_name] for move_name in move_names], h_delta, heuristic)
+
+    @property
+    def move_names(self):
+        return [MOVE_NAMES[code] for code in self.moves]
+
+    @property
+    def move_string(self):
+        """Moves as one letter each, e.g. "UULDR"."""
+        return "".join(MOVE_NAMES[code][0] for code in self.moves)
+
+    def states(self):
+        """Every PuzzleState along the path, built on first use."""
+        if self._states is None:
+            self._states = apply_moves(self.initial_state, self.move_names, self.h_delta, self.heuristic)
+        return self._states
+
+    def __len__(self):
+        return len(self.moves) + 1
+
+    def __getitem__(self, index):
+        return self.states()[index]
+
+    def __repr__(self):
+        return f"SolutionPath({self.move_string!r})"
@@ -0,0 +1,56 @@
+"""
+Solvability pre-check for N x N sliding puzzles.
+
+The goal is assumed to be tiles 1..N*N-1 in row-major order with the
+blank in the bottom-right corner. For odd N a board is solvable iff its
+inversion count is even. For even N it is solvable iff the inversion
+count plus the blank's row counted from the bottom (1-based) is odd.
+"""
+
+from collections import namedtuple
+
+SolvabilityResult = namedtuple("SolvabilityResult", ["solvable", "inversions", "blank_row", "reason"])
+
+
+def count_inversions(tiles):
+    """Number of pairs (i < j) with tiles[i] > tiles[j]."""
+    inversions = 0
+    for i, tile in enumerate(tiles):
+        for other in tiles[i + 1:]:
+            if tile > other:
+                inversions += 1
+    return inversions
+
+
+def check_solvability(board, expected_size=None):
+    """
+    Validate a board and decide whether it can reach the goal.
+
+    When `expected_size` is given, boards of any other size are rejected.
+    """
+    size = len(board)
+    if size == 0 or any(len(row) != size for row in board):
+        return SolvabilityResult(False, 0, -1, "Board must be square")
+    if expected_size is not None and size != expected_size:
+        return SolvabilityResult(False, 0, -1, f"Board must be {expected_size}x{expected_size}, got {size}x{size}")
+
+    flat = [value for row in board for value in row]
+    if sorted(flat) != list(range(size * size)):
+        return SolvabilityResult(False, 0, -1, f"Board must contain each number 0-{size * size - 1} exactly once")
+
+    blank_row = flat.index(0) // size
+    inversions = count_inversions([value for value in flat if value != 0])
+    if size % 2 == 1:
+        solvable = inversions % 2 == 0
+    else:
+        solvable = (inversions + size - blank_row) % 2 == 1
+
+    if solvable:
+        return SolvabilityResult(True, inversions, blank_row, "")
+    return SolvabilityResult(False, inversions, blank_row,
+                             f"Unsolvable: {inversions} inversions with the blank in row {blank_row + 1} "
+                             f"give the wrong permutation parity")
+
+
+def is_solvable(board, expected_size=None):
+    return check_solvability(board, expected_size).solvable
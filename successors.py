@@ -0,0 +1,157 @@
+"""
+Shared successor generation for every solver.
+
+Moves are named after the direction the blank travels. For each board
+size and blank position the legal (target cell, move name) pairs are
+precomputed once, together with a per-last-move view that drops the move
+undoing the parent's move, so expanding a state is a table lookup plus a
+swap on the packed board.
+"""
+
+from collections import namedtuple
+
+from puzzle_state import BOARD_SIZE, PuzzleState, cell_bits
+
+MOVE_DIRECTIONS = ((-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right"))
+OPPOSITE_MOVE = {"Up": "Down", "Down": "Up", "Left": "Right", "Right": "Left"}
+
+# 2-bit move codes; the reverse of a move is always `code ^ 1`
+MOVE_NAMES = tuple(move_name for _, _, move_name in MOVE_DIRECTIONS)
+MOVE_CODES = {move_name: code for code, move_name in enumerate(MOVE_NAMES)}
+
+MoveTables = namedtuple("MoveTables", ["size", "cell_bits", "cell_mask", "moves", "pruned", "targets"])
+
+
+def _build_move_table(size, bits):
+    """blank index -> tuple of (target index, target bit shift, move name)."""
+    table = []
+    for blank in range(size * size):
+        row, col = divmod(blank, size)
+        moves = []
+        for dr, dc, move_name in MOVE_DIRECTIONS:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < size and 0 <= new_col < size:
+                target = new_row * size + new_col
+                moves.append((target, target * bits, move_name))
+        table.append(tuple(moves))
+    return tuple(table)
+
+
+def _build_pruned_table(move_table):
+    """blank index -> {last move name: moves excluding the reverse of last move}."""
+    pruned = []
+    for moves in move_table:
+        by_last_move = {"": moves}
+        for last_move, reverse in OPPOSITE_MOVE.items():
+            by_last_move[last_move] = tuple(m for m in moves if m[2] != reverse)
+        pruned.append(by_last_move)
+    return tuple(pruned)
+
+
+def _build_target_table(move_table):
+    """blank index -> target index per move code, -1 where the move is illegal."""
+    targets = []
+    for moves in move_table:
+        by_code = [-1] * len(MOVE_NAMES)
+        for target, _, move_name in moves:
+            by_code[MOVE_CODES[move_name]] = target
+        targets.append(tuple(by_code))
+    return tuple(targets)
+
+
+_MOVE_TABLES = {}
+
+
+def move_tables(size=BOARD_SIZE):
+    """Precomputed move tables for a size x size board, built on first use."""
+    tables = _MOVE_TABLES.get(size)
+    if tables is None:
+        bits = cell_bits(size)
+        move_table = _build_move_table(size, bits)
+        tables = MoveTables(size, bits, (1 << bits) - 1, move_table,
+                            _build_pruned_table(move_table), _build_target_table(move_table))
+        _MOVE_TABLES[size] = tables
+    return tables
+
+
+# 3x3 tables, used directly by the 3x3-only distance table
+MOVE_TABLE = move_tables(BOARD_SIZE).moves
+PRUNED_MOVE_TABLE = move_tables(BOARD_SIZE).pruned
+MOVE_TARGETS = move_tables(BOARD_SIZE).targets
+
+
+def expand(state, h_delta=None, heuristic=None):
+    """
+    Generate the children of a state.
+
+    The move that would undo the state's own move is skipped, since it
+    only leads back to the parent. Children get g = parent g + 1. When
+    `h_delta` (e.g. heuristics.manhattan_tables(size).delta) is given,
+    each child's h is the parent's h plus the delta for the tile that
+    moved. A `heuristic` object with cells_of() and move_delta() (e.g. a
+    pattern_database.PatternDatabase) takes precedence over `h_delta`.
+    Otherwise h = 0.
+    """
+    size = state.size
+    tables = _MOVE_TABLES.get(size) or move_tables(size)
+    cell_mask = tables.cell_mask
+    packed = state.packed
+    blank = state.blank
+    blank_shift = blank * tables.cell_bits
+    g = state.g + 1
+    h = 0
+    cells = heuristic.cells_of(packed) if heuristic is not None else None
+    children = []
+    for target, target_shift, move_name in tables.pruned[blank][state.move]:
+        tile = (packed >> target_shift) & cell_mask
+        child_packed = packed ^ (tile << target_shift) | (tile << blank_shift)
+        if cells is not None:
+            h = state.h + heuristic.move_delta(cells, tile, blank)
+        elif h_delta is not None:
+            h = state.h + h_delta[tile][target][blank]
+        children.append(PuzzleState.from_packed(child_packed, target, size, g, h, state, move_name))
+    return children
+
+
+def apply_moves(initial_state, moves, h_delta=None, heuristic=None):
+    """
+    Replay a sequence of move names from a state and return every state
+    along the way, including the initial one. `h_delta` and `heuristic`
+    set each state's h as in expand().
+    """
+    targets = move_tables(initial_state.size).targets
+    path = [initial_state]
+    current = initial_state
+    for move_name in moves:
+        target = targets[current.blank][MOVE_CODES[move_name]]
+        h = 0
+        if heuristic is not None:
+            h = current.h + heuristic.move_delta(heuristic.cells_of(current.packed), current.tile_at(target), current.blank)
+        elif h_delta is not None:
+            h = current.h + h_delta[current.tile_at(target)][target][current.blank]
+        current = current.slide(target, g=current.g + 1, h=h, move=move_name)
+        path.append(current)
+    return path
+
+
+def trace_moves(move_codes, packed, blank, size=BOARD_SIZE):
+    """
+    Move codes from the root of a search to a board, read back from a map
+    of packed board -> code of the move that first reached it (-1 at the
+    root), e.g. a permutation_rank.new_move_map().
+    """
+    tables = _MOVE_TABLES.get(size) or move_tables(size)
+    cell_mask = tables.cell_mask
+    cell_bits = tables.cell_bits
+    codes = []
+    code = move_codes[packed]
+    while code != -1:
+        codes.append(code)
+        # Undo the move: the blank steps back the opposite way
+        parent_blank = tables.targets[blank][code ^ 1]
+        tile = (packed >> (parent_blank * cell_bits)) & cell_mask
+        packed = packed ^ (tile << (parent_blank * cell_bits)) | (tile << (blank * cell_bits))
+        blank = parent_blank
+        code = move_codes[packed]
+    codes.reverse()
+    return codes
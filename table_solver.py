@@ -0,0 +1,92 @@
+from puzzle_state import PuzzleState
+from solvability import check_solvability
+from permutation_rank import rank
+from successors import MOVE_TARGETS
+from distance_table import DEFAULT_TABLE_PATH, UNREACHABLE, load_distance_table
+from search_control import CHECK_INTERVAL, SearchBudget, run_search
+from solution_path import SolutionPath
+
+
+class TableSolver:
+    """Optimal 3x3 solver that follows best moves from the precomputed distance table."""
+
+    def __init__(self, table_path=DEFAULT_TABLE_PATH):
+        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+        self.table_path = table_path
+        self.table = None
+        self.nodes_explored = 0
+        self.visited_nodes = 0
+        self.solvability = None
+        self.partial_result = None  # Never set: a lookup finishes in at most 31 steps
+        self.stats = None  # SearchStats of the last solve, see search_control
+
+    def load_table(self):
+        if self.table is None:
+            self.table = load_distance_table(self.table_path)
+        return self.table
+
+    def lookup(self, state):
+        """Table byte for a state: (distance << 2) | best move code, or UNREACHABLE."""
+        return self.load_table()[rank(state.packed)]
+
+    def solve(self, initial_board, limits=None):
+        """Optimal path read from the table. `limits` is accepted for interface parity and unused."""
+        return run_search(self.solve_iter(initial_board, limits))
+
+    def solve_iter(self, initial_board, limits=None, interval=CHECK_INTERVAL):
+        """solve() as a generator. A lookup is too short to report progress, so it only yields the result."""
+        budget = SearchBudget(limits, interval)
+        self.stats = budget.stats
+        solution = self._lookup(initial_board, budget.stats)
+        yield budget.finished(self, solution)
+
+    def _lookup(self, initial_board, stats):
+        self.solvability = check_solvability(initial_board, 3)
+        if not self.solvability.solvable:
+            self.nodes_explored = 0
+            self.visited_nodes = 0
+            return None
+
+        table = self.load_table()
+        current = PuzzleState(board=initial_board, g=0, h=0)
+        stats.phase("search")
+        entry = table[rank(current.packed)]
+        self.nodes_explored = 1
+        self.visited_nodes = 1
+
+        if entry == UNREACHABLE:
+            return None
+
+        current.h = entry >> 2
+        initial_state = current
+        moves = bytearray()
+        while entry >> 2:
+            move_code = entry & 3
+            moves.append(move_code)
+            current = current.slide(MOVE_TARGETS[current.blank][move_code])
+            entry = table[rank(current.packed)]
+            self.nodes_explored += 1
+
+        self.visited_nodes = self.nodes_explored
+        # Every board on the path is one table lookup, i.e. one exact h, and
+        # only the best move out of it is ever generated
+        stats.generated = len(moves)
+        stats.heuristic_evaluations = self.nodes_explored
+        stats.max_frontier = 1
+        stats.max_depth = len(moves)
+        stats.phase("path")
+        return SolutionPath(initial_state, moves)
+
+    def display_solution(self, solution):
+        if solution is None:
+            print("No solution to print.")
+            return
+        
+        print(f"\nTable Solution found in {len(solution) - 1} moves:\n")
+        for i, state in enumerate(solution):
+            if state.move:
+                print(f"Move {i}: {state.move}")
+            else:
+                print(f"Initial State:")
+            state.display_board()
+            print()